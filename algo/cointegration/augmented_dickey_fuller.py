@@ -1,5 +1,11 @@
 import numpy as np
+from collections import namedtuple
+from statsmodels.tsa.adfvalues import mackinnoncrit, mackinnonp
 from statsmodels.tsa.stattools import adfuller
+from typing import Optional
+
+
+ADFLagResult = namedtuple("adf_lag_result", "test_pass lag statistic critical_values")
 
 
 def adf_stationarity(x: np.ndarray, trend: str, verbose: bool = False) -> bool:
@@ -17,11 +23,30 @@ def adf_stationarity(x: np.ndarray, trend: str, verbose: bool = False) -> bool:
 
     Returns:
 
+    """
+    return adf_stationarity_lag(x, trend=trend, verbose=verbose)[0]
+
+
+def adf_stationarity_lag(x: np.ndarray, trend: str, verbose: bool = False, lag: Optional[int] = None) -> ADFLagResult:
+    """
+    As `adf_stationarity`, but also returns the lag order used by the test, and its statistic.
+
+    Args:
+        lag: fixed lag order, e.g. from a previous AIC search over similar data. Skips the AIC search if given.
+
+    Returns:
+        test_pass:       as `adf_stationarity`.
+        lag:             lag order of the regression.
+        statistic:       ADF test statistic.
+        critical_values: {"1%", "5%", "10%"} critical values of the statistic.
     """
     _msg = lambda l: f"REJECT the null hypothesis of a unit root in the residuals at the {l} significance level. " \
                      f"S1 and S2 are cointegrated."
 
-    adf = adfuller(x, regression=trend, autolag="AIC")
+    if lag is None:
+        adf = adfuller(x, regression=trend, autolag="AIC")
+    else:
+        adf = adfuller(x, regression=trend, maxlag=lag, autolag=None)
 
     critical_value_test_pass = False
     test_statistic = adf[0]
@@ -40,4 +65,84 @@ def adf_stationarity(x: np.ndarray, trend: str, verbose: bool = False) -> bool:
     if verbose and not test_pass:
         print("Failed to reject the null hypothesis - no cointegration.")
 
-    return test_pass
+    return ADFLagResult(test_pass, adf[2], test_statistic, critical_values)
+
+
+ADFBatchResult = namedtuple("adf_batch_result", "statistic p_value critical_values nobs")
+
+
+def adf_batched(X: np.ndarray, lag: int, trend: str = "c") -> ADFBatchResult:
+    """
+    Augmented Dickey-Fuller test statistics for many series at once, with a fixed lag order.
+
+    Each column is regressed on its own lagged level and lagged differences, so the design matrices differ per column:
+    they are stacked into one (m, nobs, k) array and every regression is solved together via its normal equations.
+    Matches `statsmodels.tsa.stattools.adfuller(x, regression=trend, maxlag=lag, autolag=None)` column by column.
+    P-values and critical values are MacKinnon's (1994, 2010), as used by statsmodels.
+
+    Args:
+        X:     (n, m) array, one series per column, e.g. the spreads of every B candidate or of a universe of pairs.
+        lag:   number of lagged differences in the regression.
+        trend: {"n", "c", "ct"}: no deterministic terms, constant, constant and linear trend.
+
+    Returns:
+        statistic:       (m,) ADF test statistics.
+        p_value:         (m,) approximate p-values.
+        critical_values: {"1%", "5%", "10%"} critical values, shared by every column (same number of observations).
+        nobs:            number of observations in each regression.
+    """
+    X = np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        X = X[:, None]
+
+    n, m = X.shape
+    dX = np.diff(X, axis=0)
+    nobs = n - 1 - lag
+    assert nobs > 0, "Not enough data for the requested lag."
+
+    # Dependent variable: dx_t. Regressors: x_{t-1}, dx_{t-1}, ..., dx_{t-lag}, deterministic terms.
+    y = dX[lag:].T
+    regressors = [X[lag:-1]] + [dX[lag - j:-j] for j in range(1, lag + 1)]
+
+    deterministic = {
+        "n": [],
+        "c": [np.ones(nobs)],
+        "ct": [np.ones(nobs), np.arange(1.0, nobs + 1.0)],
+    }[trend]
+    regressors += [np.broadcast_to(d[:, None], (nobs, m)) for d in deterministic]
+
+    # Shape: (m, nobs, k)
+    design = np.stack(regressors, axis=-1).transpose(1, 0, 2)
+    k = design.shape[-1]
+
+    design_T = design.transpose(0, 2, 1)
+    XtX_inv = np.linalg.inv(design_T @ design)
+    params = XtX_inv @ (design_T @ y[:, :, None])
+
+    residuals = y - (design @ params)[:, :, 0]
+    params = params[:, :, 0]
+    sigma_sq = np.einsum("mi,mi->m", residuals, residuals) / (nobs - k)
+    statistic = params[:, 0] / np.sqrt(sigma_sq * XtX_inv[:, 0, 0])
+
+    p_value = np.array([mackinnonp(stat, regression=trend, N=1) for stat in statistic])
+    critical_values = dict(zip(["1%", "5%", "10%"], mackinnoncrit(N=1, regression=trend, nobs=nobs)))
+
+    return ADFBatchResult(statistic, p_value, critical_values, nobs)
+
+
+def adf_stationarity_batched(X: np.ndarray, lag: int, trend: str = "c") -> np.ndarray:
+    """
+    `adf_stationarity` for every column of `X`, with a fixed lag order.
+
+    Returns:
+        (m,) bool array: True where the null hypothesis of a unit root is rejected.
+    """
+    adf = adf_batched(X, lag=lag, trend=trend)
+
+    critical_value_test_pass = np.zeros_like(adf.statistic, dtype=bool)
+    for critical_value in adf.critical_values.values():
+        critical_value_test_pass |= adf.statistic < critical_value
+
+    p_value_test_pass = adf.p_value < 0.05
+
+    return critical_value_test_pass & p_value_test_pass
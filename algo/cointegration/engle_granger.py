@@ -1,10 +1,18 @@
 from statsmodels.tsa.stattools import coint
+from typing import Tuple
 
 
 def engle_granger_bidirectional(x, y, trend: str, p_value: float = 0.05) -> bool:
     # Augmented Engle-Granger two-step cointegration test. Test in both directions.
-    coint_t_stat_1, p_value_1 = coint(x, y, trend=trend, autolag="AIC")[:2]
-    coint_t_stat_2, p_value_2 = coint(y, x, trend=trend, autolag="AIC")[:2]
+    p_value_1, p_value_2 = engle_granger_p_values(x, y, trend=trend)
 
     # Did we pass the Engle-Granger Test? - Require: (True, True).
     return (p_value_1 < p_value) and (p_value_2 < p_value)
+
+
+def engle_granger_p_values(x, y, trend: str) -> Tuple[float, float]:
+    # P-values of the Engle-Granger test in both directions: (x on y, y on x).
+    coint_t_stat_1, p_value_1 = coint(x, y, trend=trend, autolag="AIC")[:2]
+    coint_t_stat_2, p_value_2 = coint(y, x, trend=trend, autolag="AIC")[:2]
+
+    return p_value_1, p_value_2
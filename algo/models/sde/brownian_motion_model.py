@@ -1,6 +1,6 @@
+import copy
 import numpy as np
-
-np.random.seed(0)
+from typing import List, Optional
 
 
 class BrownianMotion:
@@ -17,17 +17,45 @@ class BrownianMotion:
 
     If the increments are defined on a unit of time: var = 1.
 
+    Draws come from the model's own `numpy.random.Generator`, never numpy's global random state. For parallel
+    simulation, `spawn` gives models with statistically independent streams, reproducible from one seed.
+
+    Args:
+        mean:    mean of the increments.
+        std_dev: standard deviation of the increments.
+        rng:     random number generator. Default: `np.random.default_rng(seed)`.
+        seed:    seed of the default generator, e.g. an int or a `np.random.SeedSequence`.
+
     Example usage:
-        bm = BrownianMotion()
+        bm = BrownianMotion(seed=0)
         bm.W(4)
+
+        # One independent model per worker.
+        workers = bm.spawn(8)
     """
 
-    def __init__(self, mean: float=0.0, std_dev: float=1.0):
+    def __init__(
+            self,
+            mean: float = 0.0,
+            std_dev: float = 1.0,
+            rng: Optional[np.random.Generator] = None,
+            seed=None,
+    ):
         self.mean = mean
         self.std_dev = std_dev
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+
+    def spawn(self, num_children: int) -> List["BrownianMotion"]:
+        """Copies of the model, each drawing from an independent child stream of this model's generator."""
+        children = []
+        for rng in self.rng.spawn(num_children):
+            child = copy.copy(self)
+            child.rng = rng
+            children.append(child)
+        return children
 
     def dW(self, num_samples: int):
-        return np.random.normal(loc=self.mean, scale=self.std_dev, size=num_samples)
+        return self.rng.normal(loc=self.mean, scale=self.std_dev, size=num_samples)
 
     def W(self, num_samples: int):
         dW = self.dW(num_samples)
@@ -1,4 +1,5 @@
 import numpy as np
+from scipy.signal import lfilter
 from typing import Optional
 
 from algo.models.sde.brownian_motion_model import BrownianMotion
@@ -14,6 +15,8 @@ class OrnsteinUhlenbeck(BrownianMotion):
             X_0: Optional[float] = None,
             mean: float = 0.0,
             std_dev: float = 1.0,
+            rng: Optional[np.random.Generator] = None,
+            seed=None,
     ):
         """
         Args: variables are given symbolic names to mirror mathematical literature.
@@ -21,6 +24,7 @@ class OrnsteinUhlenbeck(BrownianMotion):
             theta:  asymptotic mean.
             sigma:  volatility of the process, i.e. scale of Brownian motion (std dev).
             X_0:    initial value. Free to choose any.
+            rng, seed: random number generator, see `BrownianMotion`.
 
         Examples of X_0 choices:
             - Long term mean (theta).
@@ -28,8 +32,10 @@ class OrnsteinUhlenbeck(BrownianMotion):
 
         In general:         X_t = X_0*exp(-k * t) + theta*(1 - exp(-k * t)) + sigma * exp(-k * t)*W
         If X_0 = theta:     X_t = theta + sigma * exp()-k * t * W
+
+        Simulated with the exact discretisation, see `simulate`.
         """
-        super().__init__(mean, std_dev)
+        super().__init__(mean, std_dev, rng=rng, seed=seed)
         self.k = k
         self.sigma = sigma
         self.theta = theta
@@ -37,16 +43,40 @@ class OrnsteinUhlenbeck(BrownianMotion):
         # Default: set initial value to long-run mean.
         self.X_0 = X_0 if X_0 is not None else theta
 
-    def __call__(self, num_samples: int) -> np.ndarray:
-        # Construct vector of time steps for each sample data point.
-        t = np.arange(num_samples)
-        dW = self.dW(num_samples)
+    @property
+    def stationary_std(self) -> float:
+        """Standard deviation of the process about `theta` in the long run."""
+        return self.sigma / np.sqrt(2.0 * self.k)
+
+    def simulate(self, num_steps: int, num_paths: int = 1, dt: float = 1.0, X_0=None, rng=None) -> np.ndarray:
+        """
+        Simulate paths with the exact discretisation of the process, one column per path:
+
+            X_[t+dt] = theta + exp(-k * dt) * (X_t - theta) + sigma * sqrt((1 - exp(-2k * dt)) / 2k) * Z
 
-        # Integrate wrt. Brownian Motion (W), ∫...dW.
-        exp_k_s = np.exp(self.k * t)
-        W = np.cumsum(exp_k_s * dW)
-        W = np.insert(W, 0, 0)[:-1]  # Enforce W(0)=0.
+        Each step only scales by exp(-k * dt) <= 1, so any speed of mean reversion and horizon is stable.
 
-        exp_k_t = np.exp(-self.k * t)
+        Args:
+            num_steps: number of samples per path, including the initial value.
+            num_paths: number of independent paths.
+            dt:        time step.
+            X_0:       initial value, scalar or one per path. Default: `self.X_0`.
+            rng:       source of the normal draws. Default: the model's generator.
 
-        return self.X_0 * exp_k_t + self.theta * (1 - exp_k_t) + self.sigma * exp_k_t * W
+        Returns:
+            X: shape (num_steps, num_paths).
+        """
+        rng = rng if rng is not None else self.rng
+        X_0 = np.broadcast_to(np.asarray(self.X_0 if X_0 is None else X_0, dtype=float), (num_paths,))
+
+        phi = np.exp(-self.k * dt)
+        tau = self.sigma * np.sqrt(-np.expm1(-2.0 * self.k * dt) / (2.0 * self.k))
+        noise = tau * rng.normal(loc=self.mean, scale=self.std_dev, size=(num_steps - 1, num_paths))
+
+        # Deviations from theta follow Y_t = phi * Y_[t-1] + noise_t: a first order recursive filter over time.
+        Y = lfilter([1.0], [1.0, -phi], noise, axis=0, zi=phi * (X_0 - self.theta)[None, :])[0]
+
+        return self.theta + np.vstack([X_0[None, :] - self.theta, Y])
+
+    def __call__(self, num_samples: int) -> np.ndarray:
+        return self.simulate(num_steps=num_samples)[:, 0]
@@ -1,12 +1,15 @@
 import abc
+import functools
 import math
 import warnings
 
 import numpy as np
 import pandas as pd
-from typing import Tuple
+from collections import deque
+from scipy.optimize import minimize_scalar
+from typing import Callable, Optional, Tuple
 
-from algo.models.sde.ornstein_uhlenbeck_model_parameters import HedgeParamsOU, ModelParamsOU, ModelParamsOUCandidates
+from algo.models.sde.ornstein_uhlenbeck_model_parameters import CrossMomentsOU, HedgeParamsOU, ModelParamsOU, ModelParamsOUCandidates
 
 
 class Optimiser(abc.ABC):
@@ -17,12 +20,98 @@ class Optimiser(abc.ABC):
         raise NotImplementedError
 
 
+class SearchB(abc.ABC):
+    """
+    Strategy to search for the purchase parameter B of asset 2, given a function evaluating a batch of candidates.
+    Every evaluated candidate is returned, so `ModelParamsOUCandidates.num_evaluations` is the cost of the search.
+    """
+
+    # Optimisation metric -> attribute of ModelParamsOU to maximise.
+    metric_attributes = {
+        "log_likelihood": "log_likelihood",
+        "mean_reversion": "mu",
+    }
+
+    def search(
+            self,
+            evaluate: Callable[[np.ndarray], ModelParamsOUCandidates],
+            optimisation_metric: str = "log_likelihood",
+    ) -> ModelParamsOUCandidates:
+        raise NotImplementedError
+
+
+class GridSearchB(SearchB):
+    """Exhaustive search over a fixed grid of B candidates."""
+
+    def __init__(self, B_candidates: Optional[np.ndarray] = None):
+        self.B_candidates = B_candidates if B_candidates is not None else self.default_B_candidates()
+
+    @staticmethod
+    def default_B_candidates() -> np.ndarray:
+        # B in [0.01, 1] in steps of 0.01, then 2, 3, ..., 100: at most 100 either way, i.e. 1 cent on the dollar.
+        return np.concatenate([np.linspace(0.01, 1.0, 100), np.arange(2, 101)])
+
+    def search(self, evaluate, optimisation_metric="log_likelihood"):
+        return evaluate(self.B_candidates)
+
+
+class RefinedSearchB(SearchB):
+    """
+    Coarse (log-spaced) grid to locate the best region, then bounded Brent refinement of the metric in log(B)
+    between the neighbours of the best grid point, i.e. the profile log-likelihood when optimising "log_likelihood".
+
+    Args:
+        B_min, B_max: bounds of the search.
+        num_grid:     number of coarse grid points.
+        xtol:         absolute tolerance of the refinement in log(B).
+        max_iter:     maximum number of refinement evaluations.
+    """
+
+    def __init__(self, B_min: float = 0.01, B_max: float = 100.0, num_grid: int = 13, xtol: float = 1e-4, max_iter: int = 50):
+        assert 0.0 < B_min < B_max
+        assert num_grid >= 2
+        self.B_candidates = np.geomspace(B_min, B_max, num_grid)
+        self.xtol = xtol
+        self.max_iter = max_iter
+
+    def search(self, evaluate, optimisation_metric="log_likelihood"):
+        metric = self.metric_attributes[optimisation_metric]
+
+        grid = evaluate(self.B_candidates)
+        scores = np.array([getattr(params, metric) for params in grid.model_params], dtype=float)
+        scores[~np.isfinite(scores)] = -np.inf
+        best_index = int(np.argmax(scores))
+
+        # Bracket the best grid point by its neighbours.
+        lower = self.B_candidates[max(best_index - 1, 0)]
+        upper = self.B_candidates[min(best_index + 1, len(self.B_candidates) - 1)]
+
+        refined = []
+
+        def objective(log_B):
+            params = evaluate(np.array([np.exp(log_B)])).model_params[0]
+            refined.append(params)
+            score = getattr(params, metric)
+            return -score if np.isfinite(score) else np.inf
+
+        minimize_scalar(
+            objective,
+            bounds=(np.log(lower), np.log(upper)),
+            method="bounded",
+            options={"xatol": self.xtol, "maxiter": self.max_iter},
+        )
+
+        return ModelParamsOUCandidates(model_params=grid.model_params + refined)
+
+
 class OptimiserOU(Optimiser):
 
     def __init__(
             self,
             dt: float,
             A: float = 1.0,
+            batched: bool = True,
+            search: Optional[SearchB] = None,
     ):
         super().__init__()
 
@@ -31,35 +120,71 @@ class OptimiserOU(Optimiser):
         Given a choice of ratio for asset 1, optimise for the ratio of asset 2.
 
         Args:
+            dt:      time step between observations.
+            A:       cash value held in asset 1.
+            batched: evaluate all B candidates at once from the cross-moments of the two assets,
+                     instead of building a spread and calling `model_params_ou` per candidate.
+            search:  strategy to search for B. Default: exhaustive search over a fixed grid.
         """
         self.A = A
         self.dt = dt
+        self.batched = batched
+        self.search = search if search is not None else GridSearchB()
 
     def optimise(self, asset1, asset2, optimisation_metric: str = "log_likelihood") -> Tuple[HedgeParamsOU, ModelParamsOUCandidates]:
         """
         Args:
-            optimisation_metric: ["log_likelihood", "mu"]
+            optimisation_metric: ["log_likelihood", "mean_reversion"]
+
+        Returns:
+            The optimal hedge parameters, and every candidate evaluated by the search:
+            `candidates.num_evaluations` reports the number of evaluations the search strategy used.
+        """
+        candidates = self._create_candidates(asset1, asset2, optimisation_metric)
+        hedge_parameters = self._hedge_parameters(candidates, asset1[0], asset2[0], optimisation_metric)
+
+        return hedge_parameters, candidates
+
+    def optimise_moments(
+            self,
+            moments: CrossMomentsOU,
+            series1_initial_value: float,
+            series2_initial_value: float,
+            optimisation_metric: str = "log_likelihood",
+    ) -> Tuple[HedgeParamsOU, ModelParamsOUCandidates]:
         """
-        candidates = self._create_candidates(asset1, asset2)
+        As `optimise`, but from precomputed cross-moments of the two assets, e.g. kept by `RollingMomentsOU`.
+        Costs O(#candidates), independent of the amount of data.
+        """
+        alpha = self.A / series1_initial_value
+        evaluate = functools.partial(self._create_candidates_from_moments, moments, alpha, series2_initial_value)
+        candidates = self.search.search(evaluate, optimisation_metric)
+        hedge_parameters = self._hedge_parameters(candidates, series1_initial_value, series2_initial_value, optimisation_metric)
+
+        return hedge_parameters, candidates
 
+    def _hedge_parameters(
+            self,
+            candidates: ModelParamsOUCandidates,
+            series1_initial_value: float,
+            series2_initial_value: float,
+            optimisation_metric: str,
+    ) -> HedgeParamsOU:
         optimisation = {
             "log_likelihood": candidates.max_loglikelihood,
             "mean_reversion": candidates.max_mean_reversion,
         }
         ou_model_params_optimal = optimisation[optimisation_metric]
 
-        hedge_parameters = HedgeParamsOU(
+        return HedgeParamsOU(
             ou_params=ou_model_params_optimal,
             A=self.A,
             B=ou_model_params_optimal.B,
-            series1_initial_value=asset1[0],
-            series2_initial_value=asset2[0],
+            series1_initial_value=series1_initial_value,
+            series2_initial_value=series2_initial_value,
         )
 
-        return hedge_parameters, candidates
-
     def model_params_ou(self, x: np.ndarray) -> ModelParamsOU:
-        dt = self.dt
         n = x.shape[0]
 
         # 1. Define sums - all sums are from i=1:n
@@ -80,6 +205,35 @@ class OptimiserOU(Optimiser):
         X_xy = np.sum(x[:-1] * x[1:])
 
         # 2. Optimal OU Parameters, given (alpha, beta). Explicit solution to MLE.
+        theta, mu, sigma_sq, log_likelihood = self.model_params_ou_from_sums(n, X_x, X_y, X_xx, X_yy, X_xy)
+
+        return ModelParamsOU(theta=theta, mu=mu, sigma_sq=sigma_sq, log_likelihood=log_likelihood)
+
+    def log_likelihood_ou(self, theta: float, mu: float, sigma_sq: float, x: np.ndarray) -> float:
+        dt = self.dt
+        n = x.shape[0]
+
+        # tau := sigma_tilde in the paper.
+        tau_sq = sigma_sq*(1 - np.exp(-2.0*mu*dt))/(2.0*mu)
+        tau = np.sqrt(tau_sq)
+
+        c = 1/(2.0*n*tau_sq)
+
+        residuals = x[1:] - x[:-1]*np.exp(-mu*dt) - theta*(1 - np.exp(-mu*dt))
+        sq_sum = np.dot(residuals, residuals)
+        log_likelihood = -0.5*np.log(2.0*math.pi) - np.log(tau) - c * sq_sum
+
+        return log_likelihood
+
+    def model_params_ou_from_sums(self, n: int, X_x, X_y, X_xx, X_yy, X_xy) -> Tuple:
+        """
+        Explicit solution to the MLE, given the five sums of the spread (see `model_params_ou`).
+        The sums may be arrays (one entry per candidate), in which case all outputs are arrays.
+
+        Returns:
+            (theta, mu, sigma_sq, log_likelihood)
+        """
+        dt = self.dt
 
         # Long-run mean: theta
         theta = (X_y * X_xx - X_x*X_xy) / ( n*(X_xx - X_xy) - (X_x**2 - X_x*X_y) )
@@ -95,49 +249,52 @@ class OptimiserOU(Optimiser):
         #     warnings.warn(f"mu = {mu}, should be > 0.0.")
 
         # Volatility parameter: sigma. Cleaner to find sigma_sq first, then take sqrt.
-        a = n * (1.0 - np.exp(-2.0 * mu * dt))
-        b = X_yy - 2.0*np.exp(-mu*dt)*X_xy + np.exp(-2.0*mu*dt)*X_xx - 2.0*theta*(1.0 - np.exp(-mu*dt))*(X_y - np.exp(-mu*dt)*X_x) + n*(theta**2)*( (1 - np.exp(-mu*dt))**2 )
+        exp_mu_dt = np.exp(-mu*dt)
+        a = n * (1.0 - exp_mu_dt**2)
+        b = X_yy - 2.0*exp_mu_dt*X_xy + exp_mu_dt**2*X_xx - 2.0*theta*(1.0 - exp_mu_dt)*(X_y - exp_mu_dt*X_x) + n*(theta**2)*( (1 - exp_mu_dt)**2 )
 
         sigma_sq = 2 * mu * b / a
-        assert sigma_sq > 0.0, "Vol_sq of MR must be positive."
+        assert np.all(sigma_sq > 0.0), "Vol_sq of MR must be positive."
 
-        log_likelihood = self.log_likelihood_ou(x=x, theta=theta, mu=mu, sigma_sq=sigma_sq)
+        log_likelihood = self.log_likelihood_ou_from_sums(theta, mu, sigma_sq, n, X_x, X_y, X_xx, X_yy, X_xy)
 
-        return ModelParamsOU(theta=theta, mu=mu, sigma_sq=sigma_sq, log_likelihood=log_likelihood)
+        return theta, mu, sigma_sq, log_likelihood
 
-    def log_likelihood_ou(self, theta: float, mu: float, sigma_sq: float, x: np.ndarray) -> float:
+    def log_likelihood_ou_from_sums(self, theta, mu, sigma_sq, n: int, X_x, X_y, X_xx, X_yy, X_xy):
+        """
+        `log_likelihood_ou` without touching the data: the squared residual sum over i=1:n-1 expands into the sums.
+        """
         dt = self.dt
-        n = x.shape[0]
-
-        # tau := sigma_tilde in the paper.
-        tau_sq = sigma_sq*(1 - np.exp(-2.0*mu*dt))/(2.0*mu)
-        tau = np.sqrt(tau_sq)
+        exp_mu_dt = np.exp(-mu*dt)
 
+        tau_sq = sigma_sq*(1 - exp_mu_dt**2)/(2.0*mu)
         c = 1/(2.0*n*tau_sq)
 
-        sq_sum = np.sum([(x[i] - x[i-1]*np.exp(-mu*dt) - theta*(1 - np.exp(-mu*dt)))**2 for i in range(1, n)])
-        log_likelihood = -0.5*np.log(2.0*math.pi) - np.log(tau) - c * sq_sum
-
-        return log_likelihood
+        # sum_i (x_i - x_{i-1}*exp(-mu*dt) - theta*(1 - exp(-mu*dt)))^2, with (n-1) residuals.
+        sq_sum = X_yy - 2.0*exp_mu_dt*X_xy + exp_mu_dt**2*X_xx \
+            - 2.0*theta*(1.0 - exp_mu_dt)*(X_y - exp_mu_dt*X_x) + (n - 1)*(theta**2)*((1.0 - exp_mu_dt)**2)
 
-    def _create_candidates(self, asset1, asset2):
-        start = 0.001
-        # end = 1.0
-        # end = 100.0
-        # num = int(1 / start)
-        # B_candidates = np.linspace(start, end, num)
+        return -0.5*np.log(2.0*math.pi) - 0.5*np.log(tau_sq) - c * sq_sum
 
-        # TMP
-        # B_candidates = list(range(1, 100))  # For now: constraining to 100 either way - 1 cent on the dollar.
-        # B_candidates += [1/B for B in B_candidates]
-        # B_candidates += [0]
-        # B_candidates = sorted(B_candidates)
+    def _create_candidates(self, asset1, asset2, optimisation_metric: str = "log_likelihood") -> ModelParamsOUCandidates:
+        alpha = self.A / asset1[0]
 
-        # np.linspace(0, 1.0, 101)  # To allow for 0.
-        B_candidates = np.concatenate([np.linspace(0.01, 1.0, 100), np.arange(2, 101)])
+        if self.batched:
+            # One pass over the data: the sums of every candidate spread follow from the cross-moments of the assets.
+            moments = CrossMomentsOU.from_series(asset1, asset2)
+            evaluate = functools.partial(self._create_candidates_from_moments, moments, alpha, asset2[0])
+        else:
+            evaluate = functools.partial(self._create_candidates_from_spreads, asset1, asset2, alpha)
 
-        alpha = self.A / asset1[0]
+        return self.search.search(evaluate, optimisation_metric)
 
+    def _create_candidates_from_spreads(
+            self,
+            asset1: np.ndarray,
+            asset2: np.ndarray,
+            alpha: float,
+            B_candidates: np.ndarray,
+    ) -> ModelParamsOUCandidates:
         # Create set of candidates
         model_params_candidates = []
         for B in B_candidates:
@@ -160,6 +317,106 @@ class OptimiserOU(Optimiser):
 
         return ModelParamsOUCandidates(model_params=model_params_candidates)
 
+    def _create_candidates_from_moments(
+            self,
+            moments: CrossMomentsOU,
+            alpha: float,
+            series2_initial_value: float,
+            B_candidates: np.ndarray,
+    ) -> ModelParamsOUCandidates:
+        betas = B_candidates / series2_initial_value
+
+        thetas, mus, sigma_sqs, log_likelihoods = self.model_params_ou_from_sums(moments.n, *moments.spread_sums(alpha, betas))
+
+        model_params_candidates = [
+            ModelParamsOU(theta=theta, mu=mu, sigma_sq=sigma_sq, log_likelihood=log_likelihood, B=B)
+            for theta, mu, sigma_sq, log_likelihood, B in zip(thetas, mus, sigma_sqs, log_likelihoods, B_candidates)
+        ]
+
+        return ModelParamsOUCandidates(model_params=model_params_candidates)
+
+
+class RollingMomentsOU:
+    """
+    Running `CrossMomentsOU` of two price series, updated in O(1) per bar.
+
+    Every transition (a_{i-1}, b_{i-1}) -> (a_i, b_i) contributes one term to each of the cross-moment sums:
+    appending a bar adds the transition into it, evicting the oldest bar (rolling window) subtracts the transition out of it.
+    Pass the moments and `initial_values` to `OptimiserOU.optimise_moments` to retrain without touching the data.
+
+    Args:
+        maxlen: size of the rolling window. None for an expanding window.
+
+    Example usage:
+        rolling = RollingMomentsOU(maxlen=252)
+        for a, b in zip(S0, S1):
+            rolling.append(a, b)
+        hp, candidates = optimiser.optimise_moments(rolling.moments, *rolling.initial_values)
+    """
+
+    def __init__(self, maxlen: Optional[int] = None):
+        self.maxlen = maxlen
+        self.window = deque(maxlen=maxlen)
+
+        # Ordered as the fields of CrossMomentsOU, excluding `n`.
+        self._sums = np.zeros(14)
+
+        # Subtracting transitions accumulates rounding error: rebuild the sums exactly once per full window of evictions.
+        self._num_evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.window)
+
+    @staticmethod
+    def _transition(a_x: float, b_x: float, a_y: float, b_y: float) -> np.ndarray:
+        return np.array([
+            a_x, b_x, a_y, b_y,
+            a_x*a_x, b_x*b_x, a_x*b_x,
+            a_y*a_y, b_y*b_y, a_y*b_y,
+            a_x*a_y, b_x*b_y, a_x*b_y, b_x*a_y,
+        ])
+
+    def append(self, a: float, b: float) -> None:
+        if self.maxlen is not None and len(self.window) == self.maxlen:
+            self._evict()
+
+        if len(self.window) > 0:
+            self._sums += self._transition(*self.window[-1], a, b)
+
+        self.window.append((a, b))
+
+    def _evict(self) -> None:
+        a_x, b_x = self.window.popleft()
+        if len(self.window) > 0:
+            self._sums -= self._transition(a_x, b_x, *self.window[0])
+
+        self._num_evictions += 1
+        if self._num_evictions >= self.maxlen:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        self._num_evictions = 0
+        if len(self.window) < 2:
+            self._sums = np.zeros(14)
+            return
+
+        a, b = np.array(self.window).T
+        moments = CrossMomentsOU.from_series(a, b)
+        self._sums = np.array([getattr(moments, field) for field in self._fields()])
+
+    @staticmethod
+    def _fields() -> Tuple[str, ...]:
+        return tuple(field for field in CrossMomentsOU.__dataclass_fields__ if field != "n")
+
+    @property
+    def moments(self) -> CrossMomentsOU:
+        return CrossMomentsOU(len(self.window), *self._sums)
+
+    @property
+    def initial_values(self) -> Tuple[float, float]:
+        """Oldest bar in the window: (a_0, b_0), which fixes the hedge ratios (alpha, beta) for a given (A, B)."""
+        return self.window[0]
+
 
 def estimate_halflife_ou(spread: pd.Series) -> float:
     # Shape: (m, 2), where m = n-1; n := len(spread)
@@ -0,0 +1,59 @@
+import math
+import timeit
+
+import numpy as np
+
+from algo.models.sde.ornstein_uhlenbeck_model_optimisation import OptimiserOU
+
+
+"""
+Benchmark of the OU log-likelihood: the original per-index list comprehension vs. the vectorised residual path
+(`log_likelihood_ou`) vs. the closed form from the sufficient statistics (`log_likelihood_ou_from_sums`).
+"""
+
+
+def _log_likelihood_ou_loop(optimiser, theta, mu, sigma_sq, x):
+    # Reference: the original implementation, one Python-level residual per index.
+    dt = optimiser.dt
+    n = x.shape[0]
+    tau_sq = sigma_sq*(1 - np.exp(-2.0*mu*dt))/(2.0*mu)
+    c = 1/(2.0*n*tau_sq)
+    sq_sum = np.sum([(x[i] - x[i-1]*np.exp(-mu*dt) - theta*(1 - np.exp(-mu*dt)))**2 for i in range(1, n)])
+    return -0.5*np.log(2.0*math.pi) - np.log(np.sqrt(tau_sq)) - c * sq_sum
+
+
+def _simulate_spread(n, theta=0.14, mu=80.0, sigma=0.13, dt=1.0/252, seed=0):
+    # Exact OU discretisation.
+    rng = np.random.default_rng(seed)
+    phi = np.exp(-mu*dt)
+    tau = sigma*np.sqrt((1.0 - phi**2)/(2.0*mu))
+    x = np.empty(n)
+    x[0] = theta
+    noise = rng.normal(scale=tau, size=n)
+    for i in range(1, n):
+        x[i] = theta + phi*(x[i-1] - theta) + noise[i]
+    return x
+
+
+if __name__ == "__main__":
+    dt = 1.0/252
+    optimiser = OptimiserOU(dt=dt)
+
+    for n in [2_000, 20_000, 200_000]:
+        x = _simulate_spread(n, dt=dt)
+        params = optimiser.model_params_ou(x)
+        sums = dict(X_x=np.sum(x[:-1]), X_y=np.sum(x[1:]), X_xx=np.dot(x[:-1], x[:-1]), X_yy=np.dot(x[1:], x[1:]), X_xy=np.dot(x[:-1], x[1:]))
+        args = dict(theta=params.theta, mu=params.mu, sigma_sq=params.sigma_sq)
+
+        number = 3 if n > 20_000 else 10
+        t_loop = timeit.timeit(lambda: _log_likelihood_ou_loop(optimiser, x=x, **args), number=number) / number
+        t_vec = timeit.timeit(lambda: optimiser.log_likelihood_ou(x=x, **args), number=number) / number
+        t_sums = timeit.timeit(lambda: optimiser.log_likelihood_ou_from_sums(n=n, **args, **sums), number=number) / number
+
+        ll_loop = _log_likelihood_ou_loop(optimiser, x=x, **args)
+        ll_vec = optimiser.log_likelihood_ou(x=x, **args)
+        ll_sums = optimiser.log_likelihood_ou_from_sums(n=n, **args, **sums)
+        assert np.isclose(ll_loop, ll_vec) and np.isclose(ll_loop, ll_sums)
+
+        print(f"n = {n:>7}: loop = {t_loop*1e3:9.3f} ms, vectorised = {t_vec*1e3:7.3f} ms ({t_loop/t_vec:6.0f}x), "
+              f"sums = {t_sums*1e6:6.1f} us ({t_loop/t_sums:8.0f}x)")
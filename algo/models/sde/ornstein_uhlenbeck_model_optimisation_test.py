@@ -0,0 +1,38 @@
+import numpy as np
+
+from algo.models.sde.ornstein_uhlenbeck_model_optimisation import OptimiserOU, RollingMomentsOU
+
+
+def _simulate_pair(n, B=0.6, theta=0.1, mu=50.0, sigma=0.1, dt=1.0/252, seed=0):
+    # Random walk S2, and S1 an OU spread X plus a multiple of S2: the likelihood peaks inside the grid of B.
+    rng = np.random.default_rng(seed)
+    S2 = 50.0 * np.exp(np.cumsum(rng.normal(scale=0.01, size=n)))
+
+    phi = np.exp(-mu*dt)
+    tau = sigma*np.sqrt((1.0 - phi**2)/(2.0*mu))
+    x = np.empty(n)
+    x[0] = theta
+    noise = rng.normal(scale=tau, size=n)
+    for i in range(1, n):
+        x[i] = theta + phi*(x[i-1] - theta) + noise[i]
+
+    S1 = 100.0 * (x + B / S2[0] * S2)
+    return S1, S2
+
+
+def test_optimise_moments_matches_loop():
+    dt = 1.0/252
+    S1, S2 = _simulate_pair(1_000, dt=dt)
+
+    hp_loop, candidates_loop = OptimiserOU(dt=dt, batched=False).optimise(S1, S2)
+
+    rolling = RollingMomentsOU()
+    for a, b in zip(S1, S2):
+        rolling.append(a, b)
+    hp_moments, candidates_moments = OptimiserOU(dt=dt).optimise_moments(rolling.moments, *rolling.initial_values)
+
+    assert hp_moments.B == hp_loop.B
+    assert np.isclose(hp_moments.ou_params.theta, hp_loop.ou_params.theta, rtol=1e-8)
+    assert np.isclose(hp_moments.ou_params.mu, hp_loop.ou_params.mu, rtol=1e-6)
+    assert np.isclose(hp_moments.ou_params.sigma_sq, hp_loop.ou_params.sigma_sq, rtol=1e-6)
+    assert candidates_moments.B_candidates == candidates_loop.B_candidates
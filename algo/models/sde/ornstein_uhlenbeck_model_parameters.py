@@ -1,6 +1,6 @@
 import numpy as np
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 
 @dataclass
@@ -56,6 +56,80 @@ class ModelParamsOUCandidates:
         """Convenience function to access the log-likelihoods across all candidates. Used for plotting."""
         return [p.B for p in self.model_params]
 
+    @property
+    def num_evaluations(self) -> int:
+        """Number of candidates evaluated to find the optimum."""
+        return len(self.model_params)
+
+
+@dataclass
+class CrossMomentsOU:
+    """
+    Sufficient statistics of two price series (a, b) for the OU spread x = alpha * a - beta * b.
+
+    Naming mirrors the OU sums: suffix `_x` := x_{i-1} (all but last value), `_y` := x_{i} (all but 0th value).
+    Every OU sum of the spread is bilinear in (alpha, beta), so these moments give the sums for any hedge ratio.
+    """
+    n: int
+
+    # Sum of a_{i-1}, b_{i-1}, a_{i}, b_{i}.
+    a_x: float
+    b_x: float
+    a_y: float
+    b_y: float
+
+    # Squares and products at lag 0, over i-1 and over i.
+    aa_x: float
+    bb_x: float
+    ab_x: float
+    aa_y: float
+    bb_y: float
+    ab_y: float
+
+    # Products at lag 1: a_{i-1}*a_{i}, b_{i-1}*b_{i}, a_{i-1}*b_{i}, b_{i-1}*a_{i}.
+    aa_xy: float
+    bb_xy: float
+    ab_xy: float
+    ba_xy: float
+
+    @classmethod
+    def from_series(cls, a: np.ndarray, b: np.ndarray) -> "CrossMomentsOU":
+        a = np.asarray(a, dtype=float)
+        b = np.asarray(b, dtype=float)
+        a_x, a_y = a[:-1], a[1:]
+        b_x, b_y = b[:-1], b[1:]
+
+        return cls(
+            n=a.shape[0],
+            a_x=np.sum(a_x),
+            b_x=np.sum(b_x),
+            a_y=np.sum(a_y),
+            b_y=np.sum(b_y),
+            aa_x=np.dot(a_x, a_x),
+            bb_x=np.dot(b_x, b_x),
+            ab_x=np.dot(a_x, b_x),
+            aa_y=np.dot(a_y, a_y),
+            bb_y=np.dot(b_y, b_y),
+            ab_y=np.dot(a_y, b_y),
+            aa_xy=np.dot(a_x, a_y),
+            bb_xy=np.dot(b_x, b_y),
+            ab_xy=np.dot(a_x, b_y),
+            ba_xy=np.dot(b_x, a_y),
+        )
+
+    def spread_sums(self, alpha, beta) -> Tuple:
+        """
+        The five OU sums (X_x, X_y, X_xx, X_yy, X_xy) of the spread x = alpha * a - beta * b.
+        `alpha` and `beta` may be scalars or arrays (broadcast), e.g. one beta per candidate.
+        """
+        X_x = alpha*self.a_x - beta*self.b_x
+        X_y = alpha*self.a_y - beta*self.b_y
+        X_xx = alpha**2*self.aa_x - 2.0*alpha*beta*self.ab_x + beta**2*self.bb_x
+        X_yy = alpha**2*self.aa_y - 2.0*alpha*beta*self.ab_y + beta**2*self.bb_y
+        X_xy = alpha**2*self.aa_xy - alpha*beta*(self.ab_xy + self.ba_xy) + beta**2*self.bb_xy
+
+        return X_x, X_y, X_xx, X_yy, X_xy
+
 
 @dataclass
 class HedgeParamsOU:
@@ -0,0 +1,138 @@
+import itertools
+import multiprocessing
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from algo.models.sde.ornstein_uhlenbeck_model import OrnsteinUhlenbeck
+from execution.positions import market_states
+
+
+@dataclass
+class OUMonteCarloResult:
+    """
+    Trades of the z-score strategy on simulated OU spreads, one entry per path.
+
+    entry_time:   time to the first entry, NaN if the path never enters.
+    holding_time: time from the first entry to its exit, NaN if it does not exit within the horizon.
+    pnl:          P&L of one unit of the spread over the horizon, marking any open position at the end.
+    num_trades:   number of entries.
+    """
+    z_entry: float
+    z_exit: float
+    dt: float
+    entry_time: np.ndarray
+    holding_time: np.ndarray
+    pnl: np.ndarray
+    num_trades: np.ndarray
+
+    def summary(self) -> Dict[str, float]:
+        num_trades = self.num_trades.sum()
+        return {
+            "prob_entry": np.mean(~np.isnan(self.entry_time)),
+            "mean_entry_time": np.nanmean(self.entry_time) if np.any(~np.isnan(self.entry_time)) else np.nan,
+            "prob_exit": np.mean(~np.isnan(self.holding_time)),
+            "mean_holding_time": np.nanmean(self.holding_time) if np.any(~np.isnan(self.holding_time)) else np.nan,
+            "expected_pnl": np.mean(self.pnl),
+            "std_pnl": np.std(self.pnl, ddof=1) if len(self.pnl) > 1 else np.nan,
+            "expected_num_trades": np.mean(self.num_trades),
+            "expected_pnl_per_trade": np.sum(self.pnl) / num_trades if num_trades > 0 else np.nan,
+        }
+
+
+def _first_step(condition: np.ndarray) -> np.ndarray:
+    # First step (row) where `condition` holds in each column, NaN if never.
+    return np.where(condition.any(axis=0), np.argmax(condition, axis=0), np.nan)
+
+
+def _trade_block(model, z_entry, z_exit, num_paths, num_steps, dt, mean, std, rng):
+    # Simulate and trade one block of paths.
+    X = model.simulate(num_steps=num_steps, num_paths=num_paths, dt=dt, rng=rng)
+    zscore = (X - mean) / std
+
+    # Positions, as in `zscore_signals` -> `compute_positions`: +1 long the spread, -1 short.
+    long_market, short_market = market_states(
+        1.0 * (zscore <= -z_entry), 1.0 * (zscore >= z_entry), 1.0 * (np.abs(zscore) <= z_exit)
+    )
+    positions = long_market - short_market
+
+    # Position held over each step, from the close of the previous one.
+    pnl = np.sum(positions[:-1] * np.diff(X, axis=0), axis=0)
+
+    previous = np.vstack([np.zeros((1, positions.shape[1])), positions[:-1]])
+    num_trades = np.sum((positions != previous) & (positions != 0.0), axis=0)
+
+    entry = _first_step(positions != 0.0)
+    steps = np.arange(num_steps)[:, None]
+    exit = _first_step((positions == 0.0) & (steps > np.nan_to_num(entry, nan=num_steps)))
+
+    return entry * dt, (exit - entry) * dt, pnl, num_trades
+
+
+def monte_carlo_ou_trades(
+        model: OrnsteinUhlenbeck,
+        z_entry: float,
+        z_exit: float,
+        num_paths: int,
+        num_steps: int,
+        dt: float = 1.0,
+        mean: Optional[float] = None,
+        std: Optional[float] = None,
+        block_size: int = 10_000,
+        rng: Optional[np.random.Generator] = None,
+        num_workers: int = 1,
+) -> OUMonteCarloResult:
+    """
+    Monte Carlo of the z-score pairs strategy on an OU spread: simulate `num_paths` paths of `num_steps` with the
+    exact discretisation, and trade each with the signals of `zscore_signals` and the positions of
+    `compute_positions`.
+
+    Paths are simulated and traded in blocks of `block_size`, so memory is bounded by one (num_steps, block_size)
+    block per worker whatever the number of paths. Each block draws from its own child stream of `rng`, so results
+    depend only on the generator's seed and `block_size`, not on `num_workers`.
+
+    Args:
+        model:          OU process of the spread, e.g. fitted with `OptimiserOU`.
+        z_entry:        enter long (short) the spread when the z-score is <= -z_entry (>= z_entry).
+        z_exit:         exit when |z-score| <= z_exit.
+        num_paths:      number of simulated paths.
+        num_steps:      samples per path, including the initial value `model.X_0`.
+        dt:             time step, in the units of the model parameters.
+        mean, std:      of the z-score, e.g. those of a training set. Default: theta and the stationary std dev.
+        block_size:     paths simulated at once.
+        rng:            generator to spawn the streams of the blocks from. Default: the model's generator.
+        num_workers:    processes simulating blocks in parallel.
+
+    Example usage:
+        model = OrnsteinUhlenbeck(k=ou_params.mu, theta=ou_params.theta, sigma=ou_params.sigma, seed=0)
+        result = monte_carlo_ou_trades(model, z_entry=1.0, z_exit=0.5, num_paths=1_000_000, num_steps=24*7,
+                                       num_workers=8)
+        result.summary()
+    """
+    mean = mean if mean is not None else model.theta
+    std = std if std is not None else model.stationary_std
+    rng = rng if rng is not None else model.rng
+
+    block_sizes = [min(block_size, num_paths - start) for start in range(0, num_paths, block_size)]
+    tasks = [
+        (model, z_entry, z_exit, block_num_paths, num_steps, dt, mean, std, block_rng)
+        for block_num_paths, block_rng in zip(block_sizes, rng.spawn(len(block_sizes)))
+    ]
+
+    if num_workers > 1:
+        with multiprocessing.Pool(processes=num_workers) as pool:
+            blocks = pool.starmap(_trade_block, tasks, chunksize=1)
+    else:
+        blocks = list(itertools.starmap(_trade_block, tasks))
+
+    entry_time, holding_time, pnl, num_trades = [np.concatenate(arrays) for arrays in zip(*blocks)]
+
+    return OUMonteCarloResult(
+        z_entry=z_entry,
+        z_exit=z_exit,
+        dt=dt,
+        entry_time=entry_time,
+        holding_time=holding_time,
+        pnl=pnl,
+        num_trades=num_trades,
+    )
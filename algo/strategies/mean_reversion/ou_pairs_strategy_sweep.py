@@ -0,0 +1,98 @@
+import contextlib
+import hydra
+import io
+import itertools
+import multiprocessing
+import pandas as pd
+from omegaconf import DictConfig, OmegaConf
+from typing import Dict
+
+from algo.strategies.mean_reversion.ou_pairs_strategy_backtest import build_cerebro, get_data_feed, load_pairs_data
+
+
+# Aligned data of both assets, set once per worker by `_init_worker` instead of pickled per backtest.
+_df0 = None
+_df1 = None
+
+
+def _init_worker(df0: pd.DataFrame, df1: pd.DataFrame) -> None:
+    global _df0, _df1
+    _df0 = df0
+    _df1 = df1
+
+
+def run_sweep_point(cfg_dict: Dict, params: Dict, start_date, end_date) -> Dict:
+    """
+    Run a single backtest, with the parameters `params` overriding the config, and summarise its results.
+
+    Args:
+        cfg_dict: config as a plain container, to send to worker processes.
+        params:   {dotted config key: value}, e.g. {"pairs.z_entry": 2.0}.
+    """
+    cfg = OmegaConf.create(cfg_dict)
+    for key, value in params.items():
+        OmegaConf.update(cfg, key, value)
+
+    cfg_asset0 = OmegaConf.load(f"{cfg.config_dir}/{cfg.pairs.asset0}")
+    cfg_asset1 = OmegaConf.load(f"{cfg.config_dir}/{cfg.pairs.asset1}")
+
+    interval = cfg.data.interval
+    data0 = get_data_feed(_df0, cfg_asset0.ticker, start_date, end_date, interval)
+    data1 = get_data_feed(_df1, cfg_asset1.ticker, start_date, end_date, interval)
+    cb = build_cerebro(cfg, cfg_asset0, cfg_asset1, data0, data1)
+
+    # The strategy logs every order and trade: silence it across many runs.
+    with contextlib.redirect_stdout(io.StringIO()):
+        strategy = cb.run()[0]
+
+    returns = strategy.analyzers.returns.get_analysis()
+    sharpe = strategy.analyzers.sharpe_ratio_annual.get_analysis()
+    trades = strategy.analyzers.trades.get_analysis()
+
+    return {
+        **params,
+        "returns_total": returns.get("rtot"),
+        "returns_annual": returns.get("rnorm"),
+        "sharpe_ratio_annual": sharpe.get("sharperatio"),
+        "num_trades": trades.get("total", {}).get("closed", 0),
+        "num_won": trades.get("won", {}).get("total", 0),
+        "num_lost": trades.get("lost", {}).get("total", 0),
+        "final_value": cb.broker.getvalue(),
+        **strategy.performance.summary(),
+    }
+
+
+def parameter_grid(grid: Dict) -> list:
+    """{key: [values]} -> [{key: value}] over the cartesian product of all values."""
+    keys = list(grid.keys())
+    return [dict(zip(keys, values)) for values in itertools.product(*[grid[key] for key in keys])]
+
+
+@hydra.main(config_path="configs", config_name="config_sweep")
+def run(cfg: DictConfig):
+    print(OmegaConf.to_yaml(cfg))
+
+    # Load and align the data once, for every run of the sweep.
+    _, _, df0, df1, start_date, end_date = load_pairs_data(cfg)
+
+    grid = parameter_grid(OmegaConf.to_container(cfg.sweep.grid))
+    cfg_dict = OmegaConf.to_container(cfg, resolve=True)
+    tasks = [(cfg_dict, params, start_date, end_date) for params in grid]
+    print(f"Sweeping {len(tasks)} parameter sets.")
+
+    # One backtest per task: maxtasksperchild keeps worker memory flat across long sweeps.
+    with multiprocessing.Pool(
+            processes=cfg.sweep.processes,
+            initializer=_init_worker,
+            initargs=(df0, df1),
+            maxtasksperchild=cfg.sweep.max_tasks_per_child,
+    ) as pool:
+        results = pool.starmap(run_sweep_point, tasks, chunksize=1)
+
+    df = pd.DataFrame(results).sort_values(by="sharpe_ratio_annual", ascending=False, na_position="last")
+    df.to_csv("sweep_results.csv", index=False)
+    print(df.to_string(index=False))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,135 @@
+import hydra
+import multiprocessing
+import numpy as np
+import pandas as pd
+from omegaconf import DictConfig, OmegaConf
+from typing import List, Optional, Tuple
+
+from algo.cointegration.engle_granger import engle_granger_p_values
+from algo.cointegration.johansen import johansen_95
+from algo.models.sde.ornstein_uhlenbeck_model_optimisation import estimate_halflife_ou
+
+
+# Price panel shared with the worker processes, set once per worker by `_init_worker` instead of pickled per pair.
+_prices = None
+
+
+def _init_worker(prices: np.ndarray) -> None:
+    global _prices
+    _prices = prices
+
+
+def _test_pair(i: int, j: int, trend: str, p_value: float) -> Tuple:
+    S0 = _prices[:, i]
+    S1 = _prices[:, j]
+
+    p_value_01, p_value_10 = engle_granger_p_values(S0, S1, trend=trend)
+    engle_granger = (p_value_01 < p_value) and (p_value_10 < p_value)
+    johansen = johansen_95(S0, S1)
+
+    # OLS hedge ratio (with intercept) of S0 on S1, and the half-life of the resulting spread.
+    hedge_ratio = np.polyfit(S1, S0, deg=1)[0]
+    halflife = estimate_halflife_ou(pd.Series(S0 - hedge_ratio * S1))
+
+    # Not mean reverting.
+    if not halflife > 0.0:
+        halflife = np.inf
+
+    return i, j, hedge_ratio, p_value_01, p_value_10, engle_granger, johansen, halflife
+
+
+def correlation_prefilter(prices: pd.DataFrame, min_correlation: float) -> List[Tuple[int, int, float]]:
+    """
+    Cheap first pass over every pair: keep pairs whose log returns have correlation >= `min_correlation`.
+
+    Returns:
+        [(i, j, correlation)] with i < j, column indices into `prices`.
+    """
+    log_returns = np.diff(np.log(prices.to_numpy()), axis=0)
+    correlation = np.corrcoef(log_returns, rowvar=False)
+
+    i, j = np.triu_indices(prices.shape[1], k=1)
+    keep = correlation[i, j] >= min_correlation
+
+    return list(zip(i[keep], j[keep], correlation[i, j][keep]))
+
+
+def screen_pairs(
+        prices: pd.DataFrame,
+        min_correlation: float = 0.8,
+        trend: str = "c",
+        p_value: float = 0.05,
+        processes: Optional[int] = None,
+        chunksize: int = 16,
+) -> pd.DataFrame:
+    """
+    Rank every pair in a panel of price series for pairs trading.
+
+    Pairs are first filtered on the correlation of their log returns (one vectorised pass over all N*(N-1)/2 pairs),
+    then the survivors get the Engle-Granger test in both directions, the Johansen trace test and the OU half-life
+    of their OLS spread, computed in parallel across `processes` workers.
+
+    Args:
+        prices:          aligned prices, one column per ticker, without missing values.
+        min_correlation: minimum correlation of log returns to run the cointegration tests.
+        trend:           deterministic trend of the Engle-Granger test.
+        p_value:         significance level of the Engle-Granger test.
+        processes:       number of worker processes. None: all cores.
+        chunksize:       number of pairs sent to a worker at a time.
+
+    Returns:
+        One row per tested pair, ranked: cointegrated under both tests first, then by the weaker Engle-Granger
+        p-value, then by half-life. `ticker0` and `ticker1` map to `asset0` and `asset1` of a pairs config.
+    """
+    assert prices.isna().sum().sum() == 0, "Align the price series and drop missing values before screening."
+
+    candidates = correlation_prefilter(prices, min_correlation)
+    print(f"{len(candidates)} of {prices.shape[1] * (prices.shape[1] - 1) // 2} pairs pass the correlation prefilter.")
+
+    correlations = {(i, j): c for i, j, c in candidates}
+    tasks = [(i, j, trend, p_value) for i, j, _ in candidates]
+
+    with multiprocessing.Pool(processes=processes, initializer=_init_worker, initargs=(prices.to_numpy(),)) as pool:
+        results = pool.starmap(_test_pair, tasks, chunksize=chunksize)
+
+    columns = ["i", "j", "hedge_ratio", "eg_p_value_01", "eg_p_value_10", "engle_granger", "johansen", "halflife"]
+    df = pd.DataFrame(results, columns=columns)
+
+    tickers = np.asarray(prices.columns)
+    df.insert(0, "ticker0", tickers[df["i"].to_numpy(dtype=int)])
+    df.insert(1, "ticker1", tickers[df["j"].to_numpy(dtype=int)])
+    df.insert(2, "correlation", [correlations[(i, j)] for i, j in zip(df["i"], df["j"])])
+    df["eg_p_value"] = df[["eg_p_value_01", "eg_p_value_10"]].max(axis=1)
+    df["cointegrated"] = df["engle_granger"] & df["johansen"]
+
+    df = df \
+        .drop(columns=["i", "j"]) \
+        .sort_values(by=["cointegrated", "eg_p_value", "halflife"], ascending=[False, True, True]) \
+        .reset_index(drop=True)
+    df.index.name = "rank"
+
+    return df
+
+
+@hydra.main(config_path="configs", config_name="config_screening")
+def run(cfg: DictConfig):
+    print(OmegaConf.to_yaml(cfg))
+
+    # Panel of prices: a datetime index and one column per ticker.
+    prices = pd.read_csv(cfg.prices_path, index_col=0, parse_dates=True)
+    prices = prices[list(cfg.tickers)] if cfg.tickers is not None else prices
+    prices = prices.dropna()
+
+    df = screen_pairs(
+        prices=prices,
+        min_correlation=cfg.min_correlation,
+        trend=cfg.trend,
+        p_value=cfg.p_value,
+        processes=cfg.processes,
+    )
+    df.to_csv(cfg.output_path)
+    print(df.head(cfg.num_print))
+
+
+if __name__ == "__main__":
+    run()
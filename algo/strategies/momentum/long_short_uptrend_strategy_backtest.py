@@ -2,10 +2,10 @@ import backtrader as bt
 import backtrader.analyzers as btanalyzers
 import backtrader.feeds as btfeeds
 import pandas as pd
-import yfinance as yf
 from datetime import date, datetime, timedelta
 
 from algo.strategies.momentum.long_short_uptrend_strategy import LongShortUptrendStrategy
+from etl.cache import get_price_cache
 
 
 def run(data_path, start_date, end_date):
@@ -64,9 +64,7 @@ if __name__ == "__main__":
         interval = "1d"
         end_date = date.today()
         start_date = end_date - timedelta(days=4*252)
-        df = yf.download(
-            ticker, start=start_date.strftime("%Y-%m-%d"), end=end_date.strftime("%Y-%m-%d"), interval=interval
-        )
+        df = get_price_cache().get(ticker, start_date=start_date, end_date=end_date, interval=interval)
 
         # TODO: backtrader seems to only allow dfs with OHLCV.
         # price_col_raw = "Adj Close"
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Hashable, Tuple
+
+
+class ColumnarRecorder:
+    """
+    Preallocated, array-backed store of per-step strategy outputs, converted to a DataFrame once at the end of a run.
+
+    Writing `df.loc[step, column] = value` on every bar is slow, and reallocates the frame whenever a new column
+    appears. Instead, every column of a fixed schema is allocated up front as one NumPy array and written by index.
+
+    Schema: ordered mapping of column name -> dtype, which sets the initial (missing) value of the column:
+        float:  NaN.
+        object: NaN. Use for values that are not floats, e.g. datetimes, or bools that may be missing.
+        bool:   False.
+
+    Example usage:
+        recorder = ColumnarRecorder(num_rows=3, schema={"datetime": object, "price": float, "roll": bool})
+        recorder[0, "price"] = 101.0
+        df = recorder.to_frame()
+    """
+
+    def __init__(self, num_rows: int, schema: Dict[str, type]):
+        self.num_rows = num_rows
+        self.columns = {}
+
+        for column, dtype in schema.items():
+            if dtype is bool:
+                self.columns[column] = np.zeros(num_rows, dtype=bool)
+            elif dtype is object:
+                self.columns[column] = np.full(num_rows, np.nan, dtype=object)
+            elif dtype is float:
+                self.columns[column] = np.full(num_rows, np.nan)
+            else:
+                raise ValueError(f"Unsupported dtype for column {column}: {dtype}")
+
+    def __setitem__(self, key: Tuple[int, Hashable], value) -> None:
+        row, column = key
+        self.columns[column][row] = value
+
+    def __getitem__(self, key: Tuple[int, Hashable]):
+        row, column = key
+        return self.columns[column][row]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns, index=pd.RangeIndex(self.num_rows))
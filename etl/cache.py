@@ -0,0 +1,156 @@
+import json
+import warnings
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import pandas as pd
+import yfinance as yf
+
+
+DEFAULT_CACHE_DIR = Path.home().joinpath(".cache", "trading", "prices")
+
+
+def _to_date(d: Union[str, date, datetime]) -> date:
+    if isinstance(d, str):
+        return datetime.strptime(d, "%Y-%m-%d").date()
+    if isinstance(d, datetime):
+        return d.date()
+    return d
+
+
+class PriceCache:
+    """
+    Local on-disk store of downloaded price history, one Parquet file per (interval, ticker).
+
+    Alongside each file, the cache records the date range [start, end) it holds, from the first to the last date the
+    downloads returned. A request only downloads the dates outside that range and merges them in. Dates a download
+    did not return (it failed, came back empty, or the request starts before the first bar, e.g. on a weekend) are
+    never recorded as covered, so they are requested again next time. Dates from today onwards are never recorded as
+    covered either, since today's bars are still incomplete.
+
+    Args:
+        cache_dir:  root directory of the store.
+        downloader: function with the signature of `yf.download(ticker, start, end, interval)`. Swap for a fake in tests.
+        offline:    never download: serve what the store has, and warn if it does not cover the request.
+
+    Example usage:
+        cache = PriceCache()
+        df = cache.get("CL=F", start_date="2020-01-01", end_date="2023-01-01", interval="1d")
+    """
+
+    def __init__(
+            self,
+            cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR,
+            downloader: Callable[..., pd.DataFrame] = yf.download,
+            offline: bool = False,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.downloader = downloader
+        self.offline = offline
+
+    def _paths(self, ticker: str, interval: str):
+        directory = self.cache_dir.joinpath(interval)
+        return directory.joinpath(f"{ticker}.parquet"), directory.joinpath(f"{ticker}.json")
+
+    def _load(self, ticker: str, interval: str):
+        data_path, range_path = self._paths(ticker, interval)
+        if not data_path.exists() or not range_path.exists():
+            return None, None, None
+
+        covered = json.loads(range_path.read_text())
+        return pd.read_parquet(data_path), _to_date(covered["start"]), _to_date(covered["end"])
+
+    def _save(self, ticker: str, interval: str, df: pd.DataFrame, start: date, end: date) -> None:
+        data_path, range_path = self._paths(ticker, interval)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(data_path)
+        range_path.write_text(json.dumps({"start": start.isoformat(), "end": end.isoformat()}))
+
+    def _download(self, ticker: str, start: date, end: date, interval: str) -> Optional[pd.DataFrame]:
+        print(f"Downloading {ticker} ({interval}): {start} to {end}")
+        try:
+            return self.downloader(ticker, start=start.strftime("%Y-%m-%d"), end=end.strftime("%Y-%m-%d"), interval=interval)
+        except Exception as e:
+            warnings.warn(f"Download of {ticker} ({interval}) from {start} to {end} failed: {e}")
+            return None
+
+    def get(
+            self,
+            ticker: str,
+            start_date: Union[str, date, datetime],
+            end_date: Union[str, date, datetime],
+            interval: str,
+    ) -> pd.DataFrame:
+        """
+        Price history of `ticker` in [start_date, end_date), as returned by the downloader.
+        """
+        start = _to_date(start_date)
+        end = _to_date(end_date)
+
+        df, covered_start, covered_end = self._load(ticker, interval)
+
+        # Date ranges missing from the store. Keep the covered range contiguous: fill any gap up to the request.
+        if df is None:
+            missing = [(start, end)]
+        else:
+            missing = []
+            if start < covered_start:
+                missing.append((start, covered_start))
+            if end > covered_end:
+                missing.append((covered_end, end))
+
+        if missing and self.offline:
+            warnings.warn(f"Offline: {ticker} ({interval}) is missing {missing} in the price cache.")
+            missing = []
+
+        if missing:
+            downloads = [self._download(ticker, missing_start, missing_end, interval) for missing_start, missing_end in missing]
+            downloads = [download for download in downloads if download is not None and len(download) > 0]
+
+            if downloads:
+                df = pd.concat([df] + downloads if df is not None else downloads)
+                df = df[~df.index.duplicated(keep="last")].sort_index()
+
+                # Covered range: only extended to the dates the downloads returned, joined to the stored range.
+                # A failed or empty download never widens it, so its dates are requested again next time.
+                starts = [download.index.min().date() for download in downloads]
+                ends = [download.index.max().date() + timedelta(days=1) for download in downloads]
+                new_start = min(starts + ([covered_start] if covered_start is not None else []))
+                new_end = max(ends + ([covered_end] if covered_end is not None else []))
+
+                # Today's bars are incomplete: never record them as covered.
+                new_end = min(new_end, date.today())
+                self._save(ticker, interval, df, new_start, max(new_end, new_start))
+
+        if df is None:
+            return pd.DataFrame()
+
+        return self._select(df, start, end)
+
+    @staticmethod
+    def _select(df: pd.DataFrame, start: date, end: date) -> pd.DataFrame:
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end)
+        if df.index.tz is not None:
+            start = start.tz_localize(df.index.tz)
+            end = end.tz_localize(df.index.tz)
+
+        return df[(df.index >= start) & (df.index < end)]
+
+
+# Shared by every loader in `etl` unless a cache is passed explicitly.
+_default_cache = None
+
+
+def get_price_cache() -> PriceCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = PriceCache()
+    return _default_cache
+
+
+def set_price_cache(cache: PriceCache) -> None:
+    """Replace the shared cache, e.g. with an offline cache or one with a fake downloader."""
+    global _default_cache
+    _default_cache = cache
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl.cache import PriceCache
+
+
+def _prices(start, end) -> pd.DataFrame:
+    # Daily bars on business days in [start, end), in the layout of `yf.download`.
+    index = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1), name="Date")
+    close = np.arange(len(index), dtype=float) + 50.0
+    return pd.DataFrame({"Close": close, "Volume": np.full(len(index), 100)}, index=index)
+
+
+class StubDownloader:
+    """Serves `_prices`, or the response queued for the next call, and records every call."""
+
+    def __init__(self):
+        self.calls = []
+        self.responses = []
+
+    def __call__(self, ticker, start, end, interval):
+        self.calls.append((start, end))
+        if self.responses:
+            response = self.responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+        return _prices(start, end)
+
+
+def _covered(cache, ticker="CL=F", interval="1d"):
+    _, start, end = cache._load(ticker, interval)
+    return start, end
+
+
+def test_empty_download_is_not_covered(tmp_path):
+    downloader = StubDownloader()
+    cache = PriceCache(cache_dir=tmp_path, downloader=downloader)
+    cache.get("CL=F", "2020-03-02", "2020-04-01", interval="1d")
+
+    # The earlier dates come back empty: the covered range must not grow to include them.
+    downloader.responses = [pd.DataFrame()]
+    df = cache.get("CL=F", "2020-02-03", "2020-04-01", interval="1d")
+    assert df.index.min() == pd.Timestamp("2020-03-02")
+    assert str(_covered(cache)[0]) == "2020-03-02"
+
+    # So they are requested again, and stored once the source has them.
+    df = cache.get("CL=F", "2020-02-03", "2020-04-01", interval="1d")
+    assert downloader.calls[-1] == ("2020-02-03", "2020-03-02")
+    assert df.index.min() == pd.Timestamp("2020-02-03")
+    assert str(_covered(cache)[0]) == "2020-02-03"
+
+
+def test_failed_download_is_not_covered(tmp_path):
+    downloader = StubDownloader()
+    cache = PriceCache(cache_dir=tmp_path, downloader=downloader)
+    cache.get("CL=F", "2020-03-02", "2020-04-01", interval="1d")
+
+    downloader.responses = [ConnectionError("no network")]
+    with pytest.warns(UserWarning, match="failed"):
+        df = cache.get("CL=F", "2020-03-02", "2020-05-01", interval="1d")
+    assert df.index.max() == pd.Timestamp("2020-03-31")
+    assert str(_covered(cache)[1]) == "2020-04-01"
+
+    df = cache.get("CL=F", "2020-03-02", "2020-05-01", interval="1d")
+    assert downloader.calls[-1] == ("2020-04-01", "2020-05-01")
+    assert df.index.max() == pd.Timestamp("2020-04-30")
+
+
+def test_gap_fill(tmp_path):
+    downloader = StubDownloader()
+    cache = PriceCache(cache_dir=tmp_path, downloader=downloader)
+    cache.get("CL=F", "2020-03-02", "2020-04-01", interval="1d")
+
+    # Both sides of the stored range are downloaded, and nothing else.
+    df = cache.get("CL=F", "2020-02-03", "2020-05-01", interval="1d")
+    assert downloader.calls[1:] == [("2020-02-03", "2020-03-02"), ("2020-04-01", "2020-05-01")]
+    pd.testing.assert_index_equal(df.index, _prices("2020-02-03", "2020-05-01").index)
+    assert [str(d) for d in _covered(cache)] == ["2020-02-03", "2020-05-01"]
+
+    # Now fully covered: no more downloads.
+    num_calls = len(downloader.calls)
+    cache.get("CL=F", "2020-02-10", "2020-04-20", interval="1d")
+    assert len(downloader.calls) == num_calls
@@ -1,12 +1,12 @@
 import pandas as pd
-import yfinance as yf
+from typing import Optional
+from etl.cache import PriceCache, get_price_cache
 
 
-def get_data(ticker, start_date, end_date, interval, convert_timezone):
-    # Download and cache data.
-    start_date = start_date.strftime("%Y-%m-%d")
-    end_date = end_date.strftime("%Y-%m-%d")
-    df = yf.download(ticker, start=start_date, end=end_date, interval=interval)
+def get_data(ticker, start_date, end_date, interval, convert_timezone, cache: Optional[PriceCache] = None):
+    # Download and cache data. Only date ranges missing from the local price cache are downloaded.
+    cache = cache if cache is not None else get_price_cache()
+    df = cache.get(ticker, start_date=start_date, end_date=end_date, interval=interval)
 
     assert len(df) > 0
     assert df.isna().sum().sum() == 0.0
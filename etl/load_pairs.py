@@ -1,6 +1,7 @@
 import pandas as pd
-import yfinance as yf
-from etl.load import get_data
+from typing import Optional
+from etl.cache import PriceCache, get_price_cache
+from etl.load_panel import get_panel_data
 
 
 def get_pairs_data(
@@ -11,6 +12,7 @@ def get_pairs_data(
         interval: str,
         name_asset1: str = "S1",
         name_asset2: str = "S2",
+        cache: Optional[PriceCache] = None,
 ) -> pd.DataFrame:
     """
     Use yfinance API to get historical data for 2 assets with the provided ticker symbols.
@@ -22,12 +24,14 @@ def get_pairs_data(
         interval: {"1m", "1h", "1d"}.
         name_asset1: output column name of asset 1.
         name_asset2: output column name of asset 2.
+        cache: local price cache. Default: the shared cache.
 
     Returns:
         df: Adj Close for both assets.
     """
-    df1 = yf.download(ticker1, start=start_date, end=end_date, interval=interval)
-    df2 = yf.download(ticker2, start=start_date, end=end_date, interval=interval)
+    cache = cache if cache is not None else get_price_cache()
+    df1 = cache.get(ticker1, start_date=start_date, end_date=end_date, interval=interval)
+    df2 = cache.get(ticker2, start_date=start_date, end_date=end_date, interval=interval)
 
     # Use common index to align dates.
     df = pd.DataFrame(index=df1.index)
@@ -45,31 +49,14 @@ def get_pairs_data(
 
 
 def get_pairs_data_backtest(ticker0, ticker1, start_date, end_date, interval, convert_timezone, roll_fn0, roll_fn1):
-    df0_raw = get_data(ticker=ticker0, start_date=start_date, end_date=end_date, interval=interval, convert_timezone=convert_timezone)
-    df1_raw = get_data(ticker=ticker1, start_date=start_date, end_date=end_date, interval=interval, convert_timezone=convert_timezone)
-
-    # Ensure timestamps align.
-    lsuffix = "_0"
-    rsuffix = "_1"
-    data_aligned_df = df0_raw.join(df1_raw, how="left", lsuffix=lsuffix, rsuffix=rsuffix)
-
-    # Drop rows where entries are missing for either asset.
-    data_aligned_df.dropna(inplace=True)
-    print(f"\tasset0 data: {df0_raw.shape}, \n\tasset1 data: {df1_raw.shape}, \n\tmerged data: {data_aligned_df.shape}")
-
-    df0 = data_aligned_df.filter(like=lsuffix)
-    df1 = data_aligned_df.filter(like=rsuffix)
-
-    # Restore original names (for backtrader).
-    df0.columns = [col.strip(lsuffix) for col in df0.columns]
-    df1.columns = [col.strip(rsuffix) for col in df1.columns]
-
-    df0["roll_date"] = 0
-    df0 = df0.groupby(by=[df0.index.month, df0.index.year])
-    df0 = df0.apply(roll_fn0, roll_date="roll_date")
-
-    df1["roll_date"] = 0
-    df1 = df1.groupby(by=[df1.index.month, df1.index.year])
-    df1 = df1.apply(roll_fn1, roll_date="roll_date")
-
-    return df0, df1
+    panel = get_panel_data(
+        tickers=[ticker0, ticker1],
+        start_date=start_date,
+        end_date=end_date,
+        interval=interval,
+        convert_timezone=convert_timezone,
+        roll_fns={ticker0: roll_fn0, ticker1: roll_fn1},
+    )
+
+    # Views of the panel, with the original column names (for backtrader) and `roll_date`.
+    return panel.asset(ticker0), panel.asset(ticker1)
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+from functools import reduce
+from typing import Callable, Dict, List, Optional, Sequence
+
+from etl.cache import PriceCache
+from etl.load import get_data
+from etl.roll_date import get_roll_dates
+
+
+class PricePanel:
+    """
+    Aligned price data of N assets on one shared timestamp index, backed by a single array of shape
+    (num_assets, num_fields, num_timestamps).
+
+    Each asset's block of the array is contiguous, so `asset` returns a DataFrame whose float columns view the panel
+    rather than copying it, and memory grows linearly in the number of assets.
+
+    The array is float64. Fields with another dtype in the source data (e.g. an integer `Volume`, and `roll_date`)
+    are recorded in `dtypes`, and `asset` casts them back: only those columns are copied.
+
+    Example usage:
+        panel = get_panel_data(["CL=F", "RB=F", "HO=F"], start_date, end_date, interval="1d", convert_timezone=False)
+        close = panel.field("Close")    # (num_timestamps, num_assets)
+        df0 = panel.asset("CL=F")       # Open, High, Low, Close, Adj Close, Volume, roll_date.
+    """
+
+    def __init__(
+            self,
+            index: pd.DatetimeIndex,
+            tickers: Sequence[str],
+            fields: Sequence[str],
+            values: np.ndarray,
+            dtypes: Optional[Dict[str, Dict[str, np.dtype]]] = None,
+    ):
+        assert values.shape == (len(tickers), len(fields), len(index))
+
+        self.index = index
+        self.tickers = list(tickers)
+        self.fields = list(fields)
+        self.values = values
+
+        # {ticker: {field: dtype}} for fields that are not float64 in the source data.
+        self.dtypes = dtypes if dtypes is not None else {}
+
+        self._ticker_map = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self._field_map = {field: j for j, field in enumerate(self.fields)}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def field(self, field: str) -> np.ndarray:
+        """Values of `field` for every asset, shape (num_timestamps, num_assets). A view of the panel."""
+        return self.values[:, self._field_map[field], :].T
+
+    def asset(self, ticker: str) -> pd.DataFrame:
+        """
+        All fields of `ticker`, in the column layout and dtypes of `get_data` plus `roll_date` (int64).
+        Float columns are views of the panel.
+        """
+        values = self.values[self._ticker_map[ticker]]
+        dtypes = self.dtypes.get(ticker, {})
+        columns = {
+            field: values[j] if field not in dtypes else values[j].astype(dtypes[field])
+            for j, field in enumerate(self.fields)
+        }
+        return pd.DataFrame(columns, index=self.index, copy=False)
+
+    def frame(self, field: str) -> pd.DataFrame:
+        """Values of `field` as a DataFrame with one column per ticker."""
+        return pd.DataFrame(self.field(field), index=self.index, columns=self.tickers, copy=False)
+
+
+def get_panel_data(
+        tickers: Sequence[str],
+        start_date,
+        end_date,
+        interval: str,
+        convert_timezone: bool,
+        roll_fns: Optional[Dict[str, Callable]] = None,
+        cache: Optional[PriceCache] = None,
+) -> PricePanel:
+    """
+    Get historical data for N assets, aligned on the timestamps common to all of them, with per-asset roll flags.
+
+    Args:
+        tickers:          ticker symbols.
+        start_date:
+        end_date:
+        interval:         {"1m", "1h", "1d"}.
+        convert_timezone: convert timestamps to UTC.
+        roll_fns:         {ticker: roll function}. Default: `get_roll_date_fn(ticker)` for every ticker.
+        cache:            local price cache. Default: the shared cache.
+
+    Returns:
+        panel: fields of the first asset's data (e.g. OHLCV) and `roll_date`, for every asset.
+    """
+    roll_fns = roll_fns if roll_fns is not None else {}
+    dfs = [
+        get_data(ticker=ticker, start_date=start_date, end_date=end_date, interval=interval,
+                 convert_timezone=convert_timezone, cache=cache)
+        for ticker in tickers
+    ]
+
+    fields: List[str] = list(dfs[0].columns)
+    for ticker, df in zip(tickers, dfs):
+        assert list(df.columns) == fields, f"{ticker} has columns {list(df.columns)}, expected {fields}."
+
+    # Timestamps where every asset has data, in the order of the first asset.
+    common = reduce(lambda index, other: index.intersection(other), [df.index for df in dfs[1:]], dfs[0].index)
+    index = dfs[0].index[dfs[0].index.isin(common)]
+
+    values = np.empty((len(tickers), len(fields) + 1, len(index)))
+    dtypes = {}
+    for i, (ticker, df) in enumerate(zip(tickers, dfs)):
+        rows = df.index.get_indexer(index)
+        values[i, :-1, :] = df.to_numpy(dtype=float)[rows].T
+        values[i, -1, :] = get_roll_dates(ticker, index, roll_fns.get(ticker))
+
+        dtypes[ticker] = {field: dtype for field, dtype in df.dtypes.items() if dtype != np.float64}
+        dtypes[ticker]["roll_date"] = np.dtype(np.int64)
+
+    shapes = ", ".join(f"{ticker}: {df.shape}" for ticker, df in zip(tickers, dfs))
+    print(f"\tasset data: {shapes}, \n\taligned data: {values.shape}")
+
+    return PricePanel(index=index, tickers=tickers, fields=fields + ["roll_date"], values=values, dtypes=dtypes)
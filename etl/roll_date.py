@@ -1,6 +1,12 @@
 import warnings
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Optional
 
 import backtrader.feeds as btfeeds
+import numpy as np
+import pandas as pd
+from backtrader import TimeFrame, date2num
 
 
 class RollDateGenericCSV(btfeeds.GenericCSVData):
@@ -8,42 +14,151 @@ class RollDateGenericCSV(btfeeds.GenericCSVData):
     params = (("roll_date", 7),)
 
 
-def identity(df, *args, **kwargs):
-    return df
+class RollDatePandasData(btfeeds.PandasData):
+    """
+    In-memory counterpart of `RollDateGenericCSV`: feeds the aligned DataFrame of `get_pairs_data_backtest` directly,
+    instead of writing it to CSV and parsing every row back again.
 
+    Columns are read once into arrays at the start of the run (rather than by `iloc` per row and line), and bars are
+    timestamped exactly as `GenericCSVData` does, including moving daily bars to the end of the session, so both
+    feeds give identical backtests.
 
-def roll_date_wti_oil(month_df, roll_date):
+    Example usage:
+        data = RollDatePandasData(dataname=df0, name="CL=F", timeframe=bt.TimeFrame.Days, tz=pytz.timezone("UTC"))
+    """
+    lines = ("roll_date",)
+    params = (
+        ("open", "Open"),
+        ("high", "High"),
+        ("low", "Low"),
+        ("close", "Close"),
+        ("volume", "Volume"),
+        ("openinterest", None),
+        ("roll_date", "roll_date"),
+    )
+
+    def start(self):
+        super(RollDatePandasData, self).start()
+
+        df = self.p.dataname
+        self._values = {
+            field: df.iloc[:, column].to_numpy(dtype=float)
+            for field, column in self._colmapping.items()
+            if field != "datetime" and column is not None
+        }
+
+        column = self._colmapping["datetime"]
+        self._datetimes = pd.DatetimeIndex(df.index if column is None else df.iloc[:, column]).to_pydatetime()
+
+    def _load(self):
+        self._idx += 1
+
+        if self._idx >= len(self._datetimes):
+            return False
+
+        for field, values in self._values.items():
+            getattr(self.lines, field)[0] = values[self._idx]
+
+        self.lines.datetime[0] = self._date2num_bar(self._datetimes[self._idx])
+
+        return True
+
+    def _date2num_bar(self, dt: datetime) -> float:
+        # As in `GenericCSVData._loadline`: daily bars without a time are stamped at the end of the session.
+        if self.p.timeframe < TimeFrame.Days:
+            return date2num(dt)
+
+        dtnum = date2num(self._tzinput.localize(dt) if self._tzinput else dt)
+        dteosnum = self.date2num(datetime.combine(dt.date(), self.p.sessionend))
+        if dteosnum > dtnum:
+            return dteosnum
+
+        return date2num(dt) if self._tzinput else dtnum
+
+
+def _month_groups(index: pd.DatetimeIndex) -> np.ndarray:
+    # One key per calendar month: rows of the same month share a key, over any number of years.
+    return (index.year * 12 + index.month).to_numpy()
+
+
+def no_roll_date(index: pd.DatetimeIndex) -> np.ndarray:
+    return np.zeros(len(index), dtype=int)
+
+
+def roll_date_wti_oil(index: pd.DatetimeIndex) -> np.ndarray:
     """
     Last trade is 4 business days before 25th if 25th is a Bday, else 5 business days before.
     https://www.cmegroup.com/markets/energy/crude-oil/micro-wti-crude-oil.contractSpecs.html
+
+    In each month, the roll date is the last trading day on or before the 21st (25th traded) or the 20th (otherwise),
+    which accounts for that day being on a weekend too.
+
+    Intraday (e.g. hourly) data: only the first bar of the roll day is marked, so the roll is triggered once.
+    This differs from the previous per-month rule, which marked the bar at midnight and raised a KeyError on days
+    without one, i.e. on most hourly data.
+
+    Example usage:
+        index = pd.date_range("2021-01-19", "2021-01-26 23:00", freq="h")
+        index = index[index.hour > 0]           # No bar at midnight.
+        index[roll_date_wti_oil(index) == 1]    # DatetimeIndex(['2021-01-21 01:00:00'])
     """
-    days = month_df.index.day.values
+    months = _month_groups(index)
+    days = pd.Series(index.day.to_numpy())
 
     expiry = 25
-    last_trade = 21 if expiry in days else 20
+    has_expiry = (days == expiry).groupby(months).transform("any").to_numpy()
+    last_trade = np.where(has_expiry, 21, 20)
 
-    # Account for `last_trade` being on a weekend too.
-    index = []
-    while len(index) == 0:
-        index = month_df.index[month_df.index.day == last_trade]
-        last_trade -= 1
-        assert last_trade > 0
+    # Latest traded day of the month on or before `last_trade`, or 0 if there is none (e.g. a partial month).
+    roll_day = days.where(days.to_numpy() <= last_trade, 0).groupby(months).transform("max").to_numpy()
+    roll = (days.to_numpy() == roll_day) & (roll_day > 0)
 
-    month_df.loc[index.strftime("%Y-%m-%d"), roll_date] = 1
+    # First bar of the roll day.
+    roll &= pd.Series(roll).groupby(months).cumsum().to_numpy() == 1
 
-    return month_df
+    return roll.astype(int)
 
 
-def roll_date_rbob(month_df, roll_date):
+def roll_date_rbob(index: pd.DatetimeIndex) -> np.ndarray:
     """
     2nd last business day.
     https://www.cmegroup.com/markets/energy/refined-products/micro-rbob-gasoline.contractSpecs.html
+
+    Intraday (e.g. hourly) data: the 2nd last bar of the month is marked, as by the previous per-month rule,
+    not a bar of the 2nd last business day.
     """
-    month_df.loc[month_df.index[-2], "roll_date"] = 1
-    return month_df
+    months = _month_groups(index)
+
+    # Second row from the end of each month.
+    roll = pd.Series(months).groupby(months).cumcount(ascending=False).to_numpy() == 1
+
+    return roll.astype(int)
+
+
+def monthly_roll_rule(month_rule: Callable) -> Callable:
+    """
+    Adapt a rule of the previous per-month interface, `month_rule(month_df, roll_date) -> month_df` setting 1 in the
+    `roll_date` column on roll dates, to the interface of `get_roll_date_fn`. Runs once per month: slower than a
+    vectorised rule, for contracts that do not have one yet.
+
+    Example usage:
+        roll = get_roll_dates("NG=F", index, roll_fn=monthly_roll_rule(roll_date_natural_gas))
+    """
+    def roll_fn(index: pd.DatetimeIndex) -> np.ndarray:
+        df = pd.DataFrame({"roll_date": np.zeros(len(index), dtype=int)}, index=index)
+        roll = np.zeros(len(index), dtype=int)
+        for positions in df.groupby(_month_groups(index)).indices.values():
+            roll[positions] = month_rule(df.iloc[positions].copy(), roll_date="roll_date")["roll_date"].to_numpy()
+        return roll
+
+    return roll_fn
 
 
 def get_roll_date_fn(ticker):
+    """
+    Contract roll rule of `ticker`: a function of a DatetimeIndex that returns 1 on roll dates and 0 elsewhere.
+    Rules of the previous per-month interface register through `monthly_roll_rule`.
+    """
     roll_fn_registry = {
         "CL=F": roll_date_wti_oil,  # Note: this function is specifically for MCL=F (1 day before CL=F).
         "MCL=F": roll_date_wti_oil,
@@ -54,6 +169,38 @@ def get_roll_date_fn(ticker):
     if ticker in roll_fn_registry:
         return roll_fn_registry[ticker]
     else:
-        warnings.warn(f"{ticker} not found in roll function registry, using identity.")
-        return identity
+        warnings.warn(f"{ticker} not found in roll function registry, using no roll dates.")
+        return no_roll_date
+
+
+# Roll calendars by (ticker, roll rule, first date, last date, number of dates), with the index they were computed on.
+_roll_date_cache = OrderedDict()
+_roll_date_cache_size = 32
+
+
+def get_roll_dates(ticker: str, index: pd.DatetimeIndex, roll_fn: Optional[Callable] = None) -> np.ndarray:
+    """
+    Roll calendar of `ticker` over `index`, computed once per ticker, roll rule and date range.
+
+    Args:
+        ticker:  ticker symbol.
+        index:   sorted dates of the data.
+        roll_fn: roll rule. Default: `get_roll_date_fn(ticker)`.
+
+    Returns:
+        1 on roll dates, 0 elsewhere, aligned with `index`.
+    """
+    roll_fn = roll_fn if roll_fn is not None else get_roll_date_fn(ticker)
+
+    key = (ticker, roll_fn, index[0], index[-1], len(index)) if len(index) > 0 else (ticker, roll_fn, None, None, 0)
+    if key in _roll_date_cache and _roll_date_cache[key][0].equals(index):
+        _roll_date_cache.move_to_end(key)
+        return _roll_date_cache[key][1].copy()
+
+    roll = roll_fn(index)
+
+    _roll_date_cache[key] = (index, roll)
+    if len(_roll_date_cache) > _roll_date_cache_size:
+        _roll_date_cache.popitem(last=False)
 
+    return roll.copy()
@@ -1,38 +1,55 @@
 import numpy as np
 
 
-def compute_positions(df_in):
-    df = df_in.copy()
+def _forward_fill_state(enter: np.ndarray, exit: np.ndarray) -> np.ndarray:
+    """
+    State that becomes 1 on `enter` and 0 on `exit` (which wins when both occur), carried forward between events
+    and 0 before the first event. Shape (num_steps,) or (num_steps, num_columns), filled along the first axis.
+    """
+    steps = np.arange(1, enter.shape[0] + 1).reshape((-1,) + (1,) * (enter.ndim - 1))
+
+    # Step (1-based) of the latest event at or before each step, 0 if none yet.
+    last_event = np.maximum.accumulate(np.where(enter | exit, steps, 0), axis=0)
+
+    # Value set by each step's event, with the initial state prepended at step 0.
+    values = np.concatenate([np.zeros((1,) + enter.shape[1:]), 1.0 * (enter & ~exit)], axis=0)
+
+    return np.take_along_axis(values, last_event, axis=0)
+
+
+def market_states(long, short, exit):
+    """
+    Whether to be long or short the portfolio at each step, from the entry and exit signals of `zscore_signals`.
 
-    # Signals to demonstrate when to propagate positions forward:
-    # - Stay long if: Z_exit_threshold < Z < Z_entry_threshold
-    # - Stay short if: Z_entry_threshold < Z < Z_exit_threshold
-    df["long_market"] = 0.0  # Must be float
-    df["short_market"] = 0.0  # Must be float
+    Signals to demonstrate when to propagate positions forward:
+    - Stay long if: Z_exit_threshold < Z < Z_entry_threshold
+    - Stay short if: Z_entry_threshold < Z < Z_exit_threshold
 
-    # Track whether to be long or short while iterating through each timestep
-    long_market = 0.0  # Must be float
-    short_market = 0.0  # Must be float
+    The state carried over from step to step is a forward fill of the latest entry or exit event. Each column of 2D
+    signals is a separate parameter set, e.g. a z-score against its own pair of thresholds.
+
+    Args:
+        long, short, exit: signals of 1.0 where they fire, shape (num_steps,) or (num_steps, num_parameter_sets).
+
+    Returns:
+        long_market, short_market: 1.0 while in a long/short position, else 0.0.
+    """
+    long = np.asarray(long) == 1.0
+    short = np.asarray(short) == 1.0
+    exit = np.asarray(exit) == 1.0
+
+    return _forward_fill_state(long, exit), _forward_fill_state(short, exit)
+
+
+def compute_positions(df_in):
+    df = df_in.copy()
 
     # Calculate when to be in the market via holding a long or short position, and when to exit the market.
-    # Hard to vectorise: note how `long_market` and `short_market` values are carried over in each loop iteration.
-    long_markets = []
-    short_markets = []
-    for i, row in enumerate(df.iterrows()):
-        if row[1]["long"] == 1.0:
-            long_market = 1
-        if row[1]["short"] == 1.0:
-            short_market = 1
-        if row[1]["exit"] == 1.0:
-            long_market = 0
-            short_market = 0
-
-        # Assign 1/0 to long_market/short_market to indicate when to stay in a position
-        long_markets.append(long_market)
-        short_markets.append(short_market)
-
-    df["long_market"] = long_markets
-    df["short_market"] = short_markets
+    # Note: `long_market` and `short_market` are carried over between steps, vectorised as a forward fill.
+    long_market, short_market = market_states(df["long"].to_numpy(), df["short"].to_numpy(), df["exit"].to_numpy())
+
+    df["long_market"] = long_market  # Must be float
+    df["short_market"] = short_market  # Must be float
     df["positions"] = df["long_market"] - df["short_market"]
 
     # Using _pos to distinguish portfolio from raw.
@@ -0,0 +1,138 @@
+import itertools
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+from execution.positions import market_states
+from performance.streaming_metrics import StreamingPerformance
+
+
+def threshold_grid(z_entries: Sequence[float], z_exits: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """Every (z_entry, z_exit) combination with z_exit < z_entry, as two aligned arrays."""
+    pairs = [(z_entry, z_exit) for z_entry, z_exit in itertools.product(z_entries, z_exits) if z_exit < z_entry]
+    z_entry, z_exit = zip(*pairs)
+    return np.array(z_entry, dtype=float), np.array(z_exit, dtype=float)
+
+
+def spread_zscore(spread, mean: Optional[float] = None, std: Optional[float] = None) -> np.ndarray:
+    """
+    Z-score of a spread against a fixed mean and standard deviation, e.g. those of a training set.
+    Default: the mean and (sample) standard deviation of `spread` itself.
+    """
+    spread = np.asarray(spread, dtype=float)
+    mean = mean if mean is not None else np.mean(spread)
+    std = std if std is not None else np.std(spread, ddof=1)
+    return (spread - mean) / std
+
+
+@dataclass
+class ResearchBacktestResult:
+    """
+    Backtests of one pair over K (z_entry, z_exit) threshold pairs. Arrays are (num_steps, K), one column per pair.
+    """
+    index: pd.Index
+    z_entry: np.ndarray
+    z_exit: np.ndarray
+    positions: np.ndarray
+    total: np.ndarray
+    returns_pc: np.ndarray
+    returns_cml: np.ndarray
+    periods_per_year: float
+
+    def equity_curves(self) -> pd.DataFrame:
+        """Cumulative returns, one column per (z_entry, z_exit)."""
+        columns = pd.MultiIndex.from_arrays([self.z_entry, self.z_exit], names=["z_entry", "z_exit"])
+        return pd.DataFrame(self.returns_cml, index=self.index, columns=columns)
+
+    def performance(self, k: int) -> StreamingPerformance:
+        """Streaming performance metrics of threshold pair `k`, as reported by the event-driven strategy."""
+        return StreamingPerformance(periods_per_year=self.periods_per_year).update_many(self.returns_cml[:, k])
+
+    def summary(self) -> pd.DataFrame:
+        """One row of metrics per (z_entry, z_exit), ranked by annualised Sharpe ratio."""
+        mean = self.returns_pc.mean(axis=0)
+        std = self.returns_pc.std(axis=0, ddof=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe_ratio_annual = np.where(std > 0.0, mean / std, np.nan) * np.sqrt(self.periods_per_year)
+
+        running_max = np.maximum.accumulate(self.returns_cml, axis=0)
+        max_drawdown = (1.0 - self.returns_cml / running_max).max(axis=0)
+
+        # A trade opens whenever the position changes to a non-zero value (from flat, or flipping sides).
+        previous = np.vstack([np.zeros((1, self.positions.shape[1])), self.positions[:-1]])
+        num_trades = ((self.positions != previous) & (self.positions != 0.0)).sum(axis=0)
+
+        df = pd.DataFrame({
+            "z_entry": self.z_entry,
+            "z_exit": self.z_exit,
+            "returns_total": self.returns_cml[-1] - 1.0,
+            "sharpe_ratio_annual": sharpe_ratio_annual,
+            "max_drawdown": max_drawdown,
+            "num_trades": num_trades,
+            "time_in_market": (self.positions != 0.0).mean(axis=0),
+        })
+
+        return df.sort_values(by="sharpe_ratio_annual", ascending=False, na_position="last").reset_index(drop=True)
+
+
+def research_backtest(
+        S1,
+        S2,
+        zscore,
+        z_entry: Sequence[float],
+        z_exit: Sequence[float],
+        periods_per_year: float = 252,
+) -> ResearchBacktestResult:
+    """
+    Vectorised backtest of the z-score pairs strategy over many (z_entry, z_exit) threshold pairs at once, for quick
+    screening before an event-driven backtrader run.
+
+    Per threshold pair, the results equal those of the DataFrame pipeline
+    `zscore_signals` -> `compute_positions` -> `compute_returns`, computed instead as one set of passes over
+    (num_steps, num_pairs) arrays.
+
+    Args:
+        S1, S2:           prices of both assets (Series keep their index in the results).
+        zscore:           z-score of the spread, e.g. from `spread_zscore`.
+        z_entry, z_exit:  aligned threshold pairs, e.g. from `threshold_grid`.
+        periods_per_year: to annualise the Sharpe ratio, e.g. 252 for daily data, 23*252 for hourly futures.
+
+    Example usage:
+        z_entry, z_exit = threshold_grid(np.arange(1.0, 3.01, 0.25), np.arange(0.0, 1.01, 0.25))
+        result = research_backtest(df["S1"], df["S2"], spread_zscore(df["spread"]), z_entry, z_exit)
+        result.summary().head()
+    """
+    index = S1.index if isinstance(S1, pd.Series) else pd.RangeIndex(len(S1))
+    S1 = np.asarray(S1, dtype=float)[:, None]
+    S2 = np.asarray(S2, dtype=float)[:, None]
+    zscore = np.asarray(zscore, dtype=float)[:, None]
+    z_entry = np.asarray(z_entry, dtype=float)
+    z_exit = np.asarray(z_exit, dtype=float)
+
+    # Signals, as in `zscore_signals`.
+    long = zscore <= -z_entry
+    short = zscore >= z_entry
+    exit = np.abs(zscore) <= z_exit
+
+    # Positions, as in `compute_positions`.
+    long_market, short_market = market_states(1.0 * long, 1.0 * short, 1.0 * exit)
+    positions = long_market - short_market
+    total = -1.0 * S1 * positions + S2 * positions
+
+    # Returns, as in `compute_returns`.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns_pc = np.vstack([np.full((1, len(z_entry)), np.nan), total[1:] / total[:-1] - 1.0])
+    returns_pc[np.isnan(returns_pc) | np.isinf(returns_pc) | (returns_pc == -1.0)] = 0.0
+    returns_cml = np.cumprod(1.0 + returns_pc, axis=0)
+
+    return ResearchBacktestResult(
+        index=index,
+        z_entry=z_entry,
+        z_exit=z_exit,
+        positions=positions,
+        total=total,
+        returns_pc=returns_pc,
+        returns_cml=returns_cml,
+        periods_per_year=periods_per_year,
+    )
@@ -1,4 +1,5 @@
 import numpy as np
+from typing import Optional
 
 
 def zscore(x, mean, std_dev):
@@ -29,3 +30,91 @@ def zscore_signals(df_in, z_entry, z_exit):
     df["exit"] = 1.0 * (np.abs(df["zscore"]) <= z_exit)
 
     return df
+
+
+class RollingZScore:
+    """
+    Running mean and (population) standard deviation of a series over an expanding or fixed-size window,
+    updated in O(1) per value with Welford's algorithm.
+
+    Fixed windows keep the values in a ring buffer: the evicted value is removed from the running moments as the new
+    value is added. To bound rounding drift, the moments are recomputed exactly once per full window of evictions.
+
+    Args:
+        maxlen: size of the window. None for an expanding window.
+
+    Example usage:
+        spread = RollingZScore(maxlen=252)
+        spread.reset(historic_spread)
+        spread.append(current_spread)
+        z_score = spread.zscore(current_spread)
+    """
+
+    def __init__(self, maxlen: Optional[int] = None):
+        self.maxlen = maxlen
+        self.buffer = np.empty(maxlen) if maxlen is not None else None
+        self.reset(np.array([]))
+
+    def __len__(self) -> int:
+        return self.n
+
+    def reset(self, x: np.ndarray) -> None:
+        """Rebuild from the values `x`, e.g. after the spread is recomputed with new hedge parameters."""
+        x = np.asarray(x, dtype=float)
+        if self.maxlen is not None:
+            x = x[-self.maxlen:]
+            self.buffer[:len(x)] = x
+            self.head = len(x) % self.maxlen  # Position of the next write, i.e. the oldest value once full.
+            self._num_evictions = 0
+
+        self.n = len(x)
+        self.mean = np.mean(x) if self.n > 0 else 0.0
+        self.M2 = np.sum((x - self.mean)**2) if self.n > 0 else 0.0
+
+    def append(self, value: float) -> None:
+        if self.maxlen is not None and self.n == self.maxlen:
+            self._replace(value)
+            return
+
+        if self.maxlen is not None:
+            self.buffer[self.head] = value
+            self.head = (self.head + 1) % self.maxlen
+
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.M2 += delta * (value - self.mean)
+
+    def _replace(self, value: float) -> None:
+        # Full window: add `value` and evict the oldest in a single update.
+        oldest = self.buffer[self.head]
+        self.buffer[self.head] = value
+        self.head = (self.head + 1) % self.maxlen
+
+        mean_old = self.mean
+        self.mean += (value - oldest) / self.n
+        self.M2 += (value - oldest) * (value - self.mean + oldest - mean_old)
+        self.M2 = max(self.M2, 0.0)
+
+        self._num_evictions += 1
+        if self._num_evictions >= self.maxlen:
+            self.reset(self.values)
+
+    @property
+    def values(self) -> np.ndarray:
+        """Values in the window, oldest first. Only available for fixed-size windows."""
+        assert self.maxlen is not None, "Values are not stored for expanding windows."
+        if self.n < self.maxlen:
+            return self.buffer[:self.n].copy()
+        return np.concatenate([self.buffer[self.head:], self.buffer[:self.head]])
+
+    @property
+    def variance(self) -> float:
+        return self.M2 / self.n if self.n > 0 else np.nan
+
+    @property
+    def std(self) -> float:
+        return np.sqrt(self.variance)
+
+    def zscore(self, x: float) -> float:
+        return zscore(x, mean=self.mean, std_dev=self.std)
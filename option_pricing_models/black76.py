@@ -34,6 +34,10 @@ class Black76Eur(GeneralisedEuropeanBlackScholes):
         b = self.cost_of_carry
         return super().put(F_t=F_t, X_t=X_t, t=t, r=r, b=b, vol=vol)
 
+    def chain(self, option_type, F_t, X_t, t, r, vol):
+        b = self.cost_of_carry
+        return super().chain(option_type=option_type, F_t=F_t, X_t=X_t, t=t, r=r, b=b, vol=vol)
+
     @property
     def cost_of_carry(self):
         # No cost of carry on the underlying (futures contract).
@@ -1,7 +1,7 @@
 import abc
 import numpy as np
 from collections import namedtuple
-from scipy.stats import norm
+from scipy.special import ndtr
 
 Greeks = namedtuple("greeks", "option_value delta gamma theta vega rho")
 
@@ -30,38 +30,64 @@ class GeneralisedEuropeanBlackScholes(abc.ABC):
         self.name = name
 
     def call(self, F_t, X_t, t, r, b, vol):
-        # Pre-calculations
-        sqrt_t = np.sqrt(t)
-        d1, d2 = self._distribution_parameters(F_t, X_t, t, r, b, vol, sqrt_t)
-
-        # Fair value price
-        option_value = F_t * np.exp((b - r) * t) * norm.cdf(d1) - X_t * np.exp(-r * t) * norm.cdf(d2)
-
-        # Greeks
-        delta = np.exp((b - r) * t) * norm.cdf(d1)
-        gamma = np.exp((b - r) * t) * norm.pdf(d1) / (F_t * vol * sqrt_t)
-        theta = -(F_t * vol * np.exp((b - r) * t) * norm.pdf(d1)) / (2 * sqrt_t) - (b - r) * F_t * np.exp(
-            (b - r) * t) * norm.cdf(d1) - r * X_t * np.exp(-r * t) * norm.cdf(d2)
-        vega = np.exp((b - r) * t) * F_t * sqrt_t * norm.pdf(d1)
-        rho = X_t * t * np.exp(-r * t) * norm.cdf(d2)
-
-        return Greeks(option_value, delta, gamma, theta, vega, rho)
+        return self._greeks(1.0, F_t, X_t, t, r, b, vol)
 
     def put(self, F_t, X_t, t, r, b, vol):
+        return self._greeks(-1.0, F_t, X_t, t, r, b, vol)
+
+    def chain(self, option_type, F_t, X_t, t, r, b, vol) -> Greeks:
+        """
+        Price an option chain: every argument may be an array (broadcast together), e.g. one entry per contract.
+
+        Args:
+            option_type: "call", "put", or an array of them, one per contract.
+
+        Returns:
+            Greeks of contiguous float arrays, one entry per contract.
+
+        Example usage:
+            greeks = gbs.chain("call", F_t=50.0, X_t=np.linspace(40, 60, 101), t=1/12, r=0.04, b=0.0, vol=0.2)
+        """
+        if isinstance(option_type, str):
+            assert option_type in ["call", "put"]
+            sign = 1.0 if option_type == "call" else -1.0
+        else:
+            option_type = np.asarray(option_type)
+            assert np.all((option_type == "call") | (option_type == "put"))
+            sign = np.where(option_type == "call", 1.0, -1.0)
+
+        arrays = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in [sign, F_t, X_t, t, r, b, vol]])
+        greeks = self._greeks(*arrays)
+
+        return Greeks(*[np.ascontiguousarray(greek) for greek in greeks])
+
+    def _greeks(self, sign, F_t, X_t, t, r, b, vol) -> Greeks:
+        """
+        Value and Greeks of calls (`sign` = 1) and puts (`sign` = -1), computing each shared term once.
+        """
         # Pre-calculations
         sqrt_t = np.sqrt(t)
         d1, d2 = self._distribution_parameters(F_t, X_t, t, r, b, vol, sqrt_t)
 
+        carry = np.exp((b - r) * t)         # Discounting of the underlying.
+        discount = np.exp(-r * t)           # Discounting of the strike.
+        cdf_d1 = ndtr(sign * d1)            # N(d1) for calls, N(-d1) for puts.
+        cdf_d2 = ndtr(sign * d2)            # N(d2) for calls, N(-d2) for puts.
+        pdf_d1 = np.exp(-0.5 * np.square(d1)) / np.sqrt(2.0 * np.pi)
+
+        F_carry_cdf_d1 = F_t * carry * cdf_d1
+        X_discount_cdf_d2 = X_t * discount * cdf_d2
+        carry_pdf_d1 = carry * pdf_d1
+
         # Fair value price
-        option_value = X_t * np.exp(-r * t) * norm.cdf(-d2) - (F_t * np.exp((b - r) * t) * norm.cdf(-d1))
+        option_value = sign * (F_carry_cdf_d1 - X_discount_cdf_d2)
 
         # Greeks
-        delta = -np.exp((b - r) * t) * norm.cdf(-d1)
-        gamma = np.exp((b - r) * t) * norm.pdf(d1) / (F_t * vol * sqrt_t)
-        theta = -(F_t * vol * np.exp((b - r) * t) * norm.pdf(d1)) / (2 * sqrt_t) + (b - r) * F_t * np.exp(
-            (b - r) * t) * norm.cdf(-d1) + r * X_t * np.exp(-r * t) * norm.cdf(-d2)
-        vega = np.exp((b - r) * t) * F_t * sqrt_t * norm.pdf(d1)
-        rho = -X_t * t * np.exp(-r * t) * norm.cdf(-d2)
+        delta = sign * carry * cdf_d1
+        gamma = carry_pdf_d1 / (F_t * vol * sqrt_t)
+        theta = -(F_t * vol * carry_pdf_d1) / (2 * sqrt_t) - sign * ((b - r) * F_carry_cdf_d1 + r * X_discount_cdf_d2)
+        vega = carry_pdf_d1 * F_t * sqrt_t
+        rho = sign * t * X_discount_cdf_d2
 
         return Greeks(option_value, delta, gamma, theta, vega, rho)
 
@@ -1,8 +1,18 @@
 from option_pricing_models.black76 import Black76Eur
-from option_pricing_models.implied_volatility_gbs import _implied_volatility_gbs
+from option_pricing_models.implied_volatility_gbs import ImpliedVolatilityResult, _implied_volatility_gbs, implied_volatility_gbs_batched
 
 
-def implied_volatility_black76_european(option_type, F_t, X_t, t, r, option_price_t, precision, max_num_iterations):
+def implied_volatility_black76_european(
+        option_type,
+        F_t,
+        X_t,
+        t,
+        r,
+        option_price_t,
+        precision,
+        max_num_iterations,
+        initial_guess="corrado_miller",
+):
     black76 = Black76Eur()
 
     # Map option type to a function to be optimised.
@@ -24,4 +34,33 @@ def implied_volatility_black76_european(option_type, F_t, X_t, t, r, option_pric
         option_price_t=option_price_t,
         precision=precision,
         max_num_iterations=max_num_iterations,
+        initial_guess=initial_guess,
+    )
+
+
+def implied_volatility_black76_european_batched(
+        option_type,
+        F_t,
+        X_t,
+        t,
+        r,
+        option_price_t,
+        precision=0.0001,
+        max_num_iterations=100,
+        initial_guess="corrado_miller",
+) -> ImpliedVolatilityResult:
+    """
+    Implied volatilities of many Black76 quotes at once, e.g. a whole chain. See `implied_volatility_gbs_batched`.
+    """
+    return implied_volatility_gbs_batched(
+        option_type=option_type,
+        F_t=F_t,
+        X_t=X_t,
+        t=t,
+        r=r,
+        b=Black76Eur().cost_of_carry,
+        option_price_t=option_price_t,
+        precision=precision,
+        max_num_iterations=max_num_iterations,
+        initial_guess=initial_guess,
     )
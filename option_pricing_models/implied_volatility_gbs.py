@@ -1,4 +1,6 @@
 import numpy as np
+from collections import namedtuple
+from scipy.special import ndtr
 
 # Reference: https://github.com/dedwards25/Python_Option_Pricing/blob/master/GBS.ipynb
 
@@ -24,6 +26,38 @@ def _approx_implied_volatility(option_type, F_t, X_t, t, r, b, option_price_t):
     return v
 
 
+def _approx_implied_volatility_corrado_miller(option_type, F_t, X_t, t, r, b, option_price_t):
+    """
+    Choose an initial value from which to start a search function, e.g. Newton Raphson.
+    From: Corrado & Miller (1996), which adds the quadratic correction for moneyness to Brenner & Subrahmanyam (1988).
+
+    Where the correction is undefined (deep in or out of the money), its square root is taken as 0.
+    """
+    # Discounted underlying and strike.
+    S = F_t*np.exp((b - r)*t)
+    K = X_t*np.exp(-r*t)
+
+    # Calls
+    payoff = S - K
+
+    # Puts
+    if option_type == "put":
+        payoff *= -1
+
+    c = option_price_t - payoff / 2.0
+    discriminant = np.maximum(c ** 2 - (payoff ** 2) / np.pi, 0.0)
+    v = np.sqrt(2.0*np.pi / t) / (S + K) * (c + np.sqrt(discriminant))
+
+    return v
+
+
+# Initial values of the implied volatility search, by name.
+INITIAL_VOLATILITY_METHODS = {
+    "brenner_subrahmanyam": _approx_implied_volatility,
+    "corrado_miller": _approx_implied_volatility_corrado_miller,
+}
+
+
 def _implied_volatility_gbs(
         option_value_fn,
         option_type,
@@ -37,6 +71,7 @@ def _implied_volatility_gbs(
         max_num_iterations=100,
         vol_min=0.0,
         vol_max=10.0,  # `10` represents 1000%, since `1` represents 100%.
+        initial_guess="corrado_miller",
 ):
     """
     Calculate Implied Volatility with a Newton Raphson search
@@ -52,10 +87,11 @@ def _implied_volatility_gbs(
         max_num_iterations: computation effort
         vol_min: volatility must be positive, some formulae may need a small positive minimum, e.g. 0.5%, i.e. 0.005.
         vol_max: not striclty necessary. Prevents erroneous choices, e.g. 20% should be 0.2, not `20`.
+        initial_guess: method of the starting volatility, a key of `INITIAL_VOLATILITY_METHODS`.
     """
 
     # Estimate starting volatility, making sure it is allowable range
-    implied_vol = _approx_implied_volatility(
+    implied_vol = INITIAL_VOLATILITY_METHODS[initial_guess](
         option_type=option_type, F_t=F_t, X_t=X_t, t=t, r=r, b=b, option_price_t=option_price_t
     )
     implied_vol = max(vol_min, min(vol_max, implied_vol))
@@ -90,3 +126,158 @@ def _implied_volatility_gbs(
         return implied_vol
     else:
         raise ValueError("Failed to converge with sufficient precision")
+
+
+# Status codes of `implied_volatility_gbs_batched`, one per quote.
+IV_CONVERGED = 0            # Newton-Raphson converged.
+IV_CONVERGED_BISECTION = 1  # Newton-Raphson diverged or stalled, bisection converged.
+IV_OUT_OF_BOUNDS = 2        # Price outside the no-arbitrage bounds: there is no implied volatility.
+IV_NOT_CONVERGED = 3        # Neither converged within the iteration limits.
+
+ImpliedVolatilityResult = namedtuple("implied_volatility_result", "implied_vol status num_iterations")
+
+
+def _value_and_vega(sign, F_t, X_t, t, r, b, vol):
+    # Only the terms that the search needs: the value and vega of calls (`sign` = 1) and puts (`sign` = -1).
+    sqrt_t = np.sqrt(t)
+    vol_sqrt_t = vol * sqrt_t
+    d1 = (np.log(F_t / X_t) + (b + np.square(vol) / 2) * t) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+
+    F_carry = F_t * np.exp((b - r) * t)
+    option_value = sign * (F_carry * ndtr(sign * d1) - X_t * np.exp(-r * t) * ndtr(sign * d2))
+    vega = F_carry * sqrt_t * np.exp(-0.5 * np.square(d1)) / np.sqrt(2.0 * np.pi)
+
+    return option_value, vega
+
+
+def implied_volatility_gbs_batched(
+        option_type,
+        F_t,
+        X_t,
+        t,
+        r,
+        b,
+        option_price_t,
+        precision=0.0001,
+        max_num_iterations=100,
+        vol_min=1e-6,
+        vol_max=10.0,
+        initial_vol=None,
+        initial_guess="corrado_miller",
+) -> ImpliedVolatilityResult:
+    """
+    Calculate Implied Volatility of many quotes at once, e.g. a whole option chain.
+
+    All quotes take Newton-Raphson steps in lockstep, each until its own valuation error is within `precision`.
+    Quotes where Newton-Raphson leaves [vol_min, vol_max], stalls, or runs out of iterations fall back to a
+    bisection search on [vol_min, vol_max], where the option value is monotonic in volatility. Failures do not raise:
+    they return NaN, with a status code per quote.
+
+    Args:
+        option_type: "call", "put", or an array of them, one per quote.
+        F_t, X_t, t, r, b, option_price_t: as in `_implied_volatility_gbs`, scalars or arrays (broadcast together).
+        precision: tolerance on the option value.
+        max_num_iterations: Newton-Raphson iterations per quote, and bisection iterations per quote.
+        vol_min, vol_max: bracket of the bisection search.
+        initial_vol: starting volatility. Default: from the `initial_guess` method.
+        initial_guess: method of the starting volatility, a key of `INITIAL_VOLATILITY_METHODS`.
+
+    Returns:
+        implied_vol:    NaN where the search failed.
+        status:         IV_CONVERGED, IV_CONVERGED_BISECTION, IV_OUT_OF_BOUNDS or IV_NOT_CONVERGED.
+        num_iterations: Newton-Raphson plus bisection iterations of each quote.
+    """
+    if isinstance(option_type, str):
+        option_type = np.array(option_type)
+    sign = np.where(np.asarray(option_type) == "call", 1.0, -1.0)
+
+    sign, F_t, X_t, t, r, b, option_price_t = np.broadcast_arrays(
+        *[np.asarray(x, dtype=float) for x in [sign, F_t, X_t, t, r, b, option_price_t]]
+    )
+    shape = F_t.shape
+    sign, F_t, X_t, t, r, b, option_price_t = [x.ravel() for x in [sign, F_t, X_t, t, r, b, option_price_t]]
+    n = F_t.size
+
+    implied_vol = np.full(n, np.nan)
+    status = np.full(n, IV_NOT_CONVERGED)
+    num_iterations = np.zeros(n, dtype=int)
+
+    # No-arbitrage bounds: above intrinsic value, below the discounted underlying (calls) or strike (puts).
+    F_carry = F_t * np.exp((b - r) * t)
+    X_discount = X_t * np.exp(-r * t)
+    lower = np.maximum(sign * (F_carry - X_discount), 0.0)
+    upper = np.where(sign > 0.0, F_carry, X_discount)
+    valid = (option_price_t > lower) & (option_price_t < upper) & (t > 0.0)
+    status[~valid] = IV_OUT_OF_BOUNDS
+
+    # Newton-Raphson on the valid quotes, in lockstep.
+    if initial_vol is None:
+        initial_vol = np.empty(n)
+        for option_sign, name in [(1.0, "call"), (-1.0, "put")]:
+            mask = sign == option_sign
+            initial_vol[mask] = INITIAL_VOLATILITY_METHODS[initial_guess](
+                name, F_t[mask], X_t[mask], t[mask], r[mask], b[mask], option_price_t[mask]
+            )
+    vol = np.clip(np.nan_to_num(np.broadcast_to(np.asarray(initial_vol, dtype=float), shape).ravel(), nan=0.5),
+                  vol_min, vol_max)
+
+    active = np.flatnonzero(valid)
+    bisect = np.zeros(n, dtype=bool)
+    min_valuation_error = np.full(n, np.inf)
+
+    for _ in range(max_num_iterations + 1):
+        if active.size == 0:
+            break
+
+        args = sign[active], F_t[active], X_t[active], t[active], r[active], b[active]
+        option_price_estimate, vega = _value_and_vega(*args, vol[active])
+        error = option_price_estimate - option_price_t[active]
+
+        converged = np.abs(error) < precision
+        implied_vol[active[converged]] = vol[active[converged]]
+        status[active[converged]] = IV_CONVERGED
+
+        # As in `_implied_volatility_gbs`: stop once the valuation error stops improving.
+        stalled = ~converged & (np.abs(error) > min_valuation_error[active])
+        min_valuation_error[active] = np.minimum(np.abs(error), min_valuation_error[active])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vol_next = vol[active] - error / vega
+        diverged = ~converged & ~(np.isfinite(vol_next) & (vol_next >= vol_min) & (vol_next <= vol_max))
+        out_of_iterations = num_iterations[active] >= max_num_iterations
+
+        failed = ~converged & (stalled | diverged | out_of_iterations)
+        bisect[active[failed]] = True
+
+        step = ~converged & ~failed
+        vol[active[step]] = vol_next[step]
+        num_iterations[active[step]] += 1
+        active = active[step]
+
+    # Bisection fallback, in lockstep.
+    active = np.flatnonzero(bisect)
+    vol_low = np.full(active.size, float(vol_min))
+    vol_high = np.full(active.size, float(vol_max))
+
+    for _ in range(max_num_iterations):
+        if active.size == 0:
+            break
+
+        vol_mid = 0.5 * (vol_low + vol_high)
+        args = sign[active], F_t[active], X_t[active], t[active], r[active], b[active]
+        option_price_estimate, _ = _value_and_vega(*args, vol_mid)
+        error = option_price_estimate - option_price_t[active]
+        num_iterations[active] += 1
+
+        converged = np.abs(error) < precision
+        implied_vol[active[converged]] = vol_mid[converged]
+        status[active[converged]] = IV_CONVERGED_BISECTION
+
+        # Option value increases with volatility.
+        vol_high = np.where(error > 0.0, vol_mid, vol_high)
+        vol_low = np.where(error > 0.0, vol_low, vol_mid)
+
+        active, vol_low, vol_high = active[~converged], vol_low[~converged], vol_high[~converged]
+
+    return ImpliedVolatilityResult(implied_vol.reshape(shape), status.reshape(shape), num_iterations.reshape(shape))
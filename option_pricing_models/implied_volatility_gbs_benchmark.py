@@ -0,0 +1,67 @@
+import timeit
+
+import numpy as np
+
+from option_pricing_models.black76 import Black76Eur
+from option_pricing_models.implied_volatility_black76 import (
+    implied_volatility_black76_european,
+    implied_volatility_black76_european_batched,
+)
+from option_pricing_models.implied_volatility_gbs import IV_CONVERGED, IV_CONVERGED_BISECTION, IV_OUT_OF_BOUNDS
+
+
+"""
+Benchmark of implied volatility over a chain of Black76 quotes: the scalar Newton-Raphson search, one quote at a
+time, vs. the batched solver, all quotes in lockstep.
+"""
+
+
+def _quotes(n: int, seed: int = 0):
+    # Quotes priced from known volatilities over a range of moneyness and expiries, calls and puts.
+    rng = np.random.default_rng(seed)
+    F_t = 80.0
+    X_t = F_t * np.exp(rng.uniform(-0.5, 0.5, size=n))
+    t = rng.uniform(1/52, 2.0, size=n)
+    vol = rng.uniform(0.1, 1.0, size=n)
+    option_type = np.where(rng.random(n) < 0.5, "call", "put")
+    option_price_t = Black76Eur().chain(option_type, F_t=F_t, X_t=X_t, t=t, r=0.04, vol=vol).option_value
+    return option_type, F_t, X_t, t, vol, option_price_t
+
+
+if __name__ == "__main__":
+    r = 0.04
+    precision = 1e-6
+
+    option_type, F_t, X_t, t, vol, option_price_t = _quotes(50_000)
+    result = implied_volatility_black76_european_batched(option_type, F_t, X_t, t, r, option_price_t, precision=precision)
+
+    solved = np.isin(result.status, [IV_CONVERGED, IV_CONVERGED_BISECTION])
+    repriced = Black76Eur().chain(option_type, F_t=F_t, X_t=X_t, t=t, r=r, vol=result.implied_vol).option_value
+    assert np.all(np.abs(repriced[solved] - option_price_t[solved]) < precision)
+
+    # Volatility is only identified to `precision / vega`: compare where vega is not negligible.
+    vega = Black76Eur().chain(option_type, F_t=F_t, X_t=X_t, t=t, r=r, vol=vol).vega
+    identified = solved & (vega > 1e-3)
+    print(f"Status counts: {dict(zip(*np.unique(result.status, return_counts=True)))}, "
+          f"max |vol error| where vega > 1e-3: {np.max(np.abs(result.implied_vol[identified] - vol[identified])):.2e}")
+
+    # Out-of-bounds quotes come back as NaN, without raising.
+    bad = implied_volatility_black76_european_batched("call", 50.0, 55.0, 1/12, r, [-1.0, 60.0])
+    assert np.all(np.isnan(bad.implied_vol)) and np.all(bad.status == IV_OUT_OF_BOUNDS)
+
+    n_scalar = 500
+    t_scalar = timeit.timeit(
+        lambda: [
+            implied_volatility_black76_european(option_type[i], F_t, X_t[i], t[i], r, option_price_t[i], precision, 100)
+            for i in range(n_scalar)
+        ],
+        number=1,
+    ) * len(X_t) / n_scalar
+
+    number = 10
+    t_batched = timeit.timeit(
+        lambda: implied_volatility_black76_european_batched(option_type, F_t, X_t, t, r, option_price_t, precision=precision),
+        number=number,
+    ) / number
+    print(f"50k quotes: scalar = {t_scalar*1e3:8.0f} ms (extrapolated), batched = {t_batched*1e3:6.1f} ms "
+          f"({t_scalar/t_batched:5.0f}x)")
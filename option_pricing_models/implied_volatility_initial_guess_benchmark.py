@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from option_pricing_models.black76 import Black76Eur
+from option_pricing_models.implied_volatility_black76 import implied_volatility_black76_european_batched
+from option_pricing_models.implied_volatility_gbs import INITIAL_VOLATILITY_METHODS, IV_CONVERGED
+
+
+"""
+Benchmark of the starting volatility of the implied volatility search: distribution of Newton-Raphson iterations
+over a grid of moneyness and expiries, for each method in `INITIAL_VOLATILITY_METHODS`.
+"""
+
+
+def _grid():
+    # Out-of-the-money quotes, as quoted in practice, priced from known volatilities.
+    F_t = 80.0
+    log_moneyness, t, vol = np.meshgrid(
+        np.linspace(-0.8, 0.8, 33), [1/52, 1/12, 0.25, 0.5, 1.0, 2.0], [0.1, 0.3, 0.6, 1.0], indexing="ij"
+    )
+    log_moneyness, t, vol = log_moneyness.ravel(), t.ravel(), vol.ravel()
+    X_t = F_t * np.exp(log_moneyness)
+    option_type = np.where(X_t >= F_t, "call", "put")
+    option_price_t = Black76Eur().chain(option_type, F_t=F_t, X_t=X_t, t=t, r=0.04, vol=vol).option_value
+
+    # Prices below a tick do not identify a volatility.
+    quoted = option_price_t > 1e-4
+    return option_type[quoted], F_t, X_t[quoted], t[quoted], vol[quoted], option_price_t[quoted], log_moneyness[quoted]
+
+
+if __name__ == "__main__":
+    r = 0.04
+    precision = 1e-8
+
+    option_type, F_t, X_t, t, vol, option_price_t, log_moneyness = _grid()
+    print(f"{len(X_t)} quotes, precision = {precision}")
+
+    for initial_guess in INITIAL_VOLATILITY_METHODS:
+        result = implied_volatility_black76_european_batched(
+            option_type, F_t, X_t, t, r, option_price_t, precision=precision, initial_guess=initial_guess
+        )
+        converged = result.status == IV_CONVERGED
+        iterations = result.num_iterations[converged]
+
+        seed = INITIAL_VOLATILITY_METHODS[initial_guess]
+        initial_vol = np.where(
+            option_type == "call",
+            seed("call", F_t, X_t, t, r, 0.0, option_price_t),
+            seed("put", F_t, X_t, t, r, 0.0, option_price_t),
+        )
+
+        print(f"\n{initial_guess}:")
+        print(f"\tmedian |initial vol error| = {np.median(np.abs(initial_vol - vol)):.3f}, "
+              f"Newton-Raphson converged = {converged.mean():.1%}, bisection fallback = {1 - converged.mean():.1%}")
+        print(f"\titerations: mean = {iterations.mean():.2f}, p50 = {np.percentile(iterations, 50):.0f}, "
+              f"p90 = {np.percentile(iterations, 90):.0f}, max = {iterations.max()}")
+        print("\tmean iterations by |log moneyness| and expiry:")
+        df = pd.DataFrame({
+            "|log moneyness|": pd.cut(np.abs(log_moneyness[converged]), [0.0, 0.1, 0.3, 0.5, 0.8], include_lowest=True),
+            "t": t[converged],
+            "iterations": iterations,
+        })
+        print(df.pivot_table(index="|log moneyness|", columns="t", values="iterations", aggfunc="mean", observed=False)
+              .round(1).to_string())
@@ -0,0 +1,154 @@
+import numpy as np
+from scipy.interpolate import CubicSpline, PPoly
+from typing import Dict
+
+from option_pricing_models.black76 import Black76Eur
+from option_pricing_models.generalised_black_scholes import Greeks
+from option_pricing_models.implied_volatility_black76 import implied_volatility_black76_european_batched
+
+
+class Black76VolatilitySurface:
+    """
+    Implied volatility surface of futures options (strike x expiry), built from solved Black76 implied volatilities,
+    to price any (F_t, X_t, t) with a lookup and one Black76 evaluation rather than a fresh implied volatility search.
+
+    Each expiry is a slice: a natural cubic spline of total variance (vol^2 * t) in log-moneyness ln(X_t / F_t), with
+    its coefficients computed once when the slice changes. Between expiries, total variance is interpolated linearly
+    in time at fixed log-moneyness. Outside the quoted strikes of a slice, and outside the quoted expiries,
+    volatility is held flat.
+
+    Quotes are keyed by (expiry, strike), one quote each, e.g. the out-of-the-money option. `update` re-solves only
+    the quotes it is given, and refits only the slices they belong to.
+
+    Args:
+        r:                  risk-free rate.
+        precision:          tolerance on the option value of the implied volatility search.
+        max_num_iterations: computation effort of the implied volatility search.
+
+    Example usage:
+        surface = Black76VolatilitySurface(r=0.04).build(option_type, F_t, X_t, t, option_price_t)
+        surface.update("call", F_t, 85.0, 0.25, 1.37)    # One quote changed.
+        greeks = surface.price("put", F_t=80.0, X_t=np.linspace(60, 100, 81), t=0.3)
+    """
+
+    def __init__(self, r: float, precision: float = 1e-6, max_num_iterations: int = 100):
+        self.r = r
+        self.precision = precision
+        self.max_num_iterations = max_num_iterations
+        self.model = Black76Eur()
+
+        # {expiry: {strike: (option_type, F_t, option_price_t, implied_vol)}}
+        self.quotes: Dict[float, Dict[float, tuple]] = {}
+
+        # Sorted expiries, and the fitted total variance spline of each.
+        self.expiries = np.array([], dtype=float)
+        self._splines = []
+        self._log_moneyness_range = []
+
+    def build(self, option_type, F_t, X_t, t, option_price_t) -> "Black76VolatilitySurface":
+        """Fit the surface to a whole chain of quotes, replacing any previous quotes."""
+        self.quotes = {}
+        self.expiries = np.array([], dtype=float)
+        self._splines = []
+        self._log_moneyness_range = []
+        return self.update(option_type, F_t, X_t, t, option_price_t)
+
+    def update(self, option_type, F_t, X_t, t, option_price_t) -> "Black76VolatilitySurface":
+        """
+        Add or replace quotes, e.g. those whose price or underlying changed since the last update.
+
+        Only these quotes are solved for implied volatility, and only their expiries are refitted. A quote with no
+        implied volatility (e.g. priced below intrinsic value) removes any previous quote at its (expiry, strike).
+        """
+        option_type, F_t, X_t, t, option_price_t = np.broadcast_arrays(
+            np.asarray(option_type), *[np.asarray(x, dtype=float) for x in [F_t, X_t, t, option_price_t]]
+        )
+        option_type, F_t, X_t, t, option_price_t = [x.ravel() for x in [option_type, F_t, X_t, t, option_price_t]]
+
+        result = implied_volatility_black76_european_batched(
+            option_type, F_t, X_t, t, self.r, option_price_t,
+            precision=self.precision, max_num_iterations=self.max_num_iterations,
+        )
+
+        for i in range(len(X_t)):
+            quotes = self.quotes.setdefault(float(t[i]), {})
+            if np.isnan(result.implied_vol[i]):
+                quotes.pop(float(X_t[i]), None)
+            else:
+                quotes[float(X_t[i])] = (str(option_type[i]), F_t[i], option_price_t[i], result.implied_vol[i])
+
+        self._refit(set(float(expiry) for expiry in t))
+        return self
+
+    def _refit(self, expiries) -> None:
+        # Expiries without quotes leave the surface.
+        for expiry in expiries:
+            if len(self.quotes[expiry]) == 0:
+                del self.quotes[expiry]
+
+        previous = {expiry: (spline, k_range) for expiry, spline, k_range in
+                    zip(self.expiries, self._splines, self._log_moneyness_range) if expiry not in expiries}
+
+        self.expiries = np.array(sorted(self.quotes), dtype=float)
+        self._splines, self._log_moneyness_range = [], []
+        for expiry in self.expiries:
+            spline, k_range = previous[expiry] if expiry in previous else self._fit_slice(expiry)
+            self._splines.append(spline)
+            self._log_moneyness_range.append(k_range)
+
+    def _fit_slice(self, expiry: float):
+        strikes = sorted(self.quotes[expiry])
+        F_t = np.array([self.quotes[expiry][strike][1] for strike in strikes])
+        implied_vol = np.array([self.quotes[expiry][strike][3] for strike in strikes])
+
+        k = np.log(np.array(strikes) / F_t)
+        total_variance = implied_vol ** 2 * expiry
+
+        order = np.argsort(k)
+        k, total_variance = k[order], total_variance[order]
+
+        if len(k) == 1:
+            # Flat smile: a constant polynomial.
+            spline = PPoly(np.array([[total_variance[0]]]), np.array([k[0], k[0] + 1.0]))
+        else:
+            spline = CubicSpline(k, total_variance, bc_type="natural")
+
+        return spline, (k[0], k[-1])
+
+    def _total_variance(self, slice_idx: np.ndarray, k: np.ndarray) -> np.ndarray:
+        # Total variance of each slice in `slice_idx`, at log-moneyness `k`, held flat outside the quoted strikes.
+        total_variance = np.empty(len(k))
+        for s in np.unique(slice_idx):
+            mask = slice_idx == s
+            k_min, k_max = self._log_moneyness_range[s]
+            total_variance[mask] = self._splines[s](np.clip(k[mask], k_min, k_max))
+        return np.maximum(total_variance, 0.0)
+
+    def implied_vol(self, F_t, X_t, t) -> np.ndarray:
+        """Implied volatility at each (F_t, X_t, t), broadcast together."""
+        assert len(self.expiries) > 0, "Build the surface first."
+
+        F_t, X_t, t = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in [F_t, X_t, t]])
+        shape = F_t.shape
+        F_t, X_t, t = F_t.ravel(), X_t.ravel(), t.ravel()
+        k = np.log(X_t / F_t)
+
+        # Bracketing expiries; the same one on both sides outside the quoted expiries.
+        hi = np.searchsorted(self.expiries, t, side="right")
+        lo = np.clip(hi - 1, 0, len(self.expiries) - 1)
+        hi = np.clip(hi, 0, len(self.expiries) - 1)
+        t_lo, t_hi = self.expiries[lo], self.expiries[hi]
+
+        w_lo = self._total_variance(lo, k)
+        w_hi = self._total_variance(hi, k)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = np.where(hi > lo, (t - t_lo) / (t_hi - t_lo), 0.0)
+            total_variance = np.where(hi > lo, (1.0 - weight) * w_lo + weight * w_hi, w_lo / t_lo * t)
+            vol = np.sqrt(total_variance / t)
+
+        return vol.reshape(shape)
+
+    def price(self, option_type, F_t, X_t, t) -> Greeks:
+        """Black76 values and greeks at each (F_t, X_t, t), at the volatility of the surface."""
+        return self.model.chain(option_type, F_t=F_t, X_t=X_t, t=t, r=self.r, vol=self.implied_vol(F_t, X_t, t))
@@ -0,0 +1,77 @@
+import timeit
+
+import numpy as np
+
+from option_pricing_models.black76 import Black76Eur
+from option_pricing_models.implied_volatility_black76 import implied_volatility_black76_european_batched
+from option_pricing_models.volatility_surface import Black76VolatilitySurface
+
+
+"""
+Benchmark of the Black76 volatility surface: fit to a chain, incremental refresh of a few quotes, and pricing of
+arbitrary (F_t, X_t, t) from the surface vs. solving implied volatility for them.
+"""
+
+
+def _smile(k, t):
+    # Skewed smile, flattening with expiry.
+    return 0.3 - 0.1 * k + 0.15 * k ** 2 / np.sqrt(t)
+
+
+def _chain(F_t: float, r: float):
+    # Out-of-the-money quotes over strikes x expiries.
+    k, t = np.meshgrid(np.linspace(-0.5, 0.5, 41), [1/12, 0.25, 0.5, 1.0, 2.0], indexing="ij")
+    k, t = k.ravel(), t.ravel()
+    X_t = F_t * np.exp(k)
+    option_type = np.where(X_t >= F_t, "call", "put")
+    option_price_t = Black76Eur().chain(option_type, F_t=F_t, X_t=X_t, t=t, r=r, vol=_smile(k, t)).option_value
+    return option_type, X_t, t, option_price_t
+
+
+if __name__ == "__main__":
+    F_t = 80.0
+    r = 0.04
+    option_type, X_t, t, option_price_t = _chain(F_t, r)
+
+    surface = Black76VolatilitySurface(r=r).build(option_type, F_t, X_t, t, option_price_t)
+
+    # Quoted options reprice from the surface.
+    repriced = surface.price(option_type, F_t, X_t, t).option_value
+    print(f"{len(X_t)} quotes, {len(surface.expiries)} expiries: "
+          f"max |repricing error| = {np.max(np.abs(repriced - option_price_t)):.2e}")
+
+    # Off the quotes, the surface interpolates the smile.
+    rng = np.random.default_rng(0)
+    n = 100_000
+    F_query = F_t * np.exp(rng.uniform(-0.05, 0.05, size=n))
+    X_query = F_t * np.exp(rng.uniform(-0.45, 0.45, size=n))
+    t_query = rng.uniform(1/12, 2.0, size=n)
+    vol_error = surface.implied_vol(F_query, X_query, t_query) - _smile(np.log(X_query / F_query), t_query)
+    print(f"{n} random (F, K, t): max |vol error| = {np.max(np.abs(vol_error)):.2e}, "
+          f"mean = {np.mean(np.abs(vol_error)):.2e}")
+
+    # Refresh a few quotes: only their expiries are refitted.
+    changed = rng.choice(len(X_t), size=5, replace=False)
+    bumped = option_price_t.copy()
+    bumped[changed] *= 1.01
+    surface.update(option_type[changed], F_t, X_t[changed], t[changed], bumped[changed])
+    rebuilt = Black76VolatilitySurface(r=r).build(option_type, F_t, X_t, t, bumped)
+    assert np.allclose(surface.implied_vol(F_query, X_query, t_query), rebuilt.implied_vol(F_query, X_query, t_query))
+
+    number = 20
+    t_build = timeit.timeit(lambda: Black76VolatilitySurface(r=r).build(option_type, F_t, X_t, t, option_price_t),
+                            number=number) / number
+    t_update = timeit.timeit(lambda: surface.update(option_type[changed], F_t, X_t[changed], t[changed], bumped[changed]),
+                             number=number) / number
+    print(f"Fit: full build = {t_build*1e3:6.2f} ms, update of {len(changed)} quotes = {t_update*1e3:6.2f} ms")
+
+    # Pricing from the surface vs. an implied volatility search for the same contracts, given their prices.
+    query_type = np.where(X_query >= F_query, "call", "put")
+    query_price = surface.price(query_type, F_query, X_query, t_query).option_value
+    t_price = timeit.timeit(lambda: surface.price(query_type, F_query, X_query, t_query), number=number) / number
+    t_solve = timeit.timeit(
+        lambda: implied_volatility_black76_european_batched(query_type, F_query, X_query, t_query, r, query_price,
+                                                            precision=1e-6),
+        number=number,
+    ) / number
+    print(f"{n} contracts: surface price = {t_price*1e3:6.1f} ms, implied volatility solve = {t_solve*1e3:6.1f} ms")
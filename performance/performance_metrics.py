@@ -80,6 +80,10 @@ def sortino_ratio(
     Leverages the Martingale property: E[X_{n+1} | X_1, ... ,X_n] = X_n to use returns at time t
     in place of expected returns from time t+1 onwards.
 
+    The downside deviation is that of excess returns below a target of 0: sqrt(E[min(excess_returns, 0)^2]).
+    Both it and the mean excess return come from running sums, so the whole column is computed in O(n).
+    Missing returns (e.g. the first percentage return) are skipped, as in `sharpe_ratio`.
+
     Args:
         df: dataframe
         returns_colname:        name of the column containing the portfolio returns.
@@ -89,26 +93,25 @@ def sortino_ratio(
     assert returns_colname in df.columns, "Dataframe must contain computed returns before computing Sortino Ratio"
     assert risk_free_returns_colname in df.columns, "Dataframe must contain risk free rate of returns before computing Sortino Ratio"
 
-    # Initial value of downside-deviation.
-    std = 0.0
-
-    # Storge to avoid editing `df` in-loop.
-    sortinos = []
-
-    for i, (_, row) in enumerate(df.iterrows()):
-
-        # Get data to date to avoid lookahead error.
-        data = df.head(i)
+    excess_returns = (df[returns_colname] - df[risk_free_returns_colname]).to_numpy(dtype=float)
+    df[output_colname] = expanding_sortino_ratio(excess_returns)
 
-        # If excess_returns are negative, update the calculation of downside-deviation
-        if row["excess_returns"] < 0.0:
-            std = data["excess_returns"].std()
+    return df
 
-        mean = data["excess_returns"].mean()
 
-        sortino = mean / std if std != 0.0 else np.nan
-        sortinos.append(sortino)
+def expanding_sortino_ratio(excess_returns: np.ndarray) -> np.ndarray:
+    """
+    Sortino Ratio of `excess_returns[:i+1]` for every i, from running sums of excess returns and of squared
+    negative excess returns. NaN while there are no downside returns yet.
+    """
+    valid = ~np.isnan(excess_returns)
+    excess_returns = np.where(valid, excess_returns, 0.0)
 
-    df[output_colname] = sortinos
+    count = np.cumsum(valid)
+    sum_excess = np.cumsum(excess_returns)
+    sum_downside_sq = np.cumsum(np.square(np.minimum(excess_returns, 0.0)))
 
-    return df
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = sum_excess / count
+        downside_deviation = np.sqrt(sum_downside_sq / count)
+        return np.where(downside_deviation > 0.0, mean / downside_deviation, np.nan)
@@ -0,0 +1,48 @@
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from performance.performance_metrics import sortino_ratio
+
+
+"""
+Benchmark of the expanding Sortino Ratio: the original per-row loop over `df.head(i)` (O(n^2)) vs. the running sums
+of `sortino_ratio` (O(n)), on up to 1M returns.
+"""
+
+
+def _sortino_ratio_loop(excess_returns: pd.Series) -> np.ndarray:
+    # Reference: the same downside deviation as `sortino_ratio`, recomputed from all history at every row.
+    sortinos = []
+    for i in range(len(excess_returns)):
+        data = excess_returns.iloc[:i+1].dropna()
+        downside_deviation = np.sqrt(np.mean(np.square(np.minimum(data, 0.0)))) if len(data) > 0 else 0.0
+        sortinos.append(data.mean() / downside_deviation if downside_deviation > 0.0 else np.nan)
+    return np.array(sortinos)
+
+
+def _returns(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"returns": rng.normal(loc=2e-4, scale=1e-2, size=n), "risk_free_returns": 1e-4})
+    df.loc[0, "returns"] = np.nan
+    return df
+
+
+if __name__ == "__main__":
+    df = _returns(2_000)
+    expected = _sortino_ratio_loop(df["returns"] - df["risk_free_returns"])
+    actual = sortino_ratio(df.copy(), "returns", "risk_free_returns")["sortino_ratio"].to_numpy()
+    assert np.allclose(expected, actual, equal_nan=True)
+
+    for n in [2_000, 10_000]:
+        df = _returns(n)
+        excess_returns = df["returns"] - df["risk_free_returns"]
+        t_loop = timeit.timeit(lambda: _sortino_ratio_loop(excess_returns), number=1)
+        t_sums = timeit.timeit(lambda: sortino_ratio(df.copy(), "returns", "risk_free_returns"), number=10) / 10
+        print(f"n = {n:>9}: loop = {t_loop*1e3:9.1f} ms, running sums = {t_sums*1e3:7.3f} ms ({t_loop/t_sums:6.0f}x)")
+
+    for n in [100_000, 1_000_000]:
+        df = _returns(n)
+        t_sums = timeit.timeit(lambda: sortino_ratio(df.copy(), "returns", "risk_free_returns"), number=5) / 5
+        print(f"n = {n:>9}: running sums = {t_sums*1e3:7.1f} ms")
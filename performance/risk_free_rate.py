@@ -1,8 +1,10 @@
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 from yahoofinancials import YahooFinancials
 
+from etl.cache import DEFAULT_CACHE_DIR, PriceCache
 from performance.performance_metrics import percentage_returns
 
 
@@ -19,7 +21,7 @@ def compute_risk_free_rate(
     method:     function to use to compute risk-free returns
     constant:   only use IFF `method=="constant"`. This is the constant value that will be applied.
                     E.g. for 0% returns, use 0.0; for 1% returns, use 0.01, etc..
-    output_colname: name of output column. Only used if method=="constant"
+    output_colname: name of output column.
 
     """
     if method == "constant":
@@ -27,13 +29,8 @@ def compute_risk_free_rate(
         df[output_colname] = constant
 
     elif method == "us_treasury_note_10yr":
-        # Get US Treasury Note data
-        start_date = datetime.strftime(df.index[0], format="%Y-%m-%d")
-        end_date = datetime.strftime(df.index[-1], format="%Y-%m-%d")
-        tnx_df = get_data_us_treasury_note_10yr(start_date, end_date)
-
-        # Left join data on date
-        df = pd.merge(df, tnx_df, left_index=True, right_index=True)
+        # US Treasury Note returns accrued at each time step, daily or intraday, from the shared local copy.
+        df[output_colname] = get_risk_free_rates().align(df.index)
 
     else:
         raise ValueError("Unsupported method for risk free rate calculation")
@@ -41,23 +38,132 @@ def compute_risk_free_rate(
     return df
 
 
-def get_data_us_treasury_note_10yr(start_date: str, end_date: str, ticker: str = "TNX") -> pd.DataFrame:
+def yahoo_financials_downloader(ticker: str, start: str, end: str, interval: str = "1d") -> pd.DataFrame:
     """
-    Use the 10-Year US Treasury Note to indicate risk free return
+    Daily prices from YahooFinancials, in the layout of `yf.download`, for use as a `PriceCache` downloader.
     """
-    yahoo_financials = YahooFinancials(ticker)
-    data = yahoo_financials.get_historical_price_data(
-        start_date=start_date, end_date=end_date, time_interval="daily"
-    )
-    df = pd.DataFrame(data[ticker]["prices"])
+    assert interval == "1d", "Only daily risk-free rates are supported."
+    data = YahooFinancials(ticker).get_historical_price_data(start_date=start, end_date=end, time_interval="daily")
+
+    prices = data[ticker].get("prices", [])
+    if len(prices) == 0:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(prices)
 
     # Reset date for convenience in joining with tick data.
     df["Date"] = pd.to_datetime(df["formatted_date"])
     df = df.drop("date", axis=1).set_index("Date")
 
-    output_colname = "risk_free_returns"
-    df = df \
-        .pipe(percentage_returns, price_colname="adjclose", output_colname=output_colname) \
-        .fillna(0.0)
+    return df.rename(columns={"adjclose": "Adj Close"})[["Adj Close"]]
+
+
+class RiskFreeRates:
+    """
+    Daily returns of a risk-free proxy (the 10-Year US Treasury Note, TNX), kept in memory once per process and
+    persisted locally through a `PriceCache`, so only dates missing from the local copy are ever downloaded.
+
+    Args:
+        ticker:   ticker symbol of the risk-free proxy.
+        cache:    local store. Default: YahooFinancials prices under the default cache directory.
+                  Pass a `PriceCache` with a stub downloader in tests.
+
+    Example usage:
+        rates = RiskFreeRates()
+        df["risk_free_returns"] = rates.align(df.index)
+    """
+
+    def __init__(self, ticker: str = "TNX", cache: Optional[PriceCache] = None):
+        self.ticker = ticker
+        self.cache = cache if cache is not None else PriceCache(
+            cache_dir=DEFAULT_CACHE_DIR.parent.joinpath("risk_free"),
+            downloader=yahoo_financials_downloader,
+        )
+
+        # In-memory copy: returns over the covered date range [start, end).
+        self.returns = None
+        self.start = None
+        self.end = None
+
+    def get(self, start_date, end_date) -> pd.Series:
+        """Daily risk-free returns in [start_date, end_date)."""
+        start = pd.Timestamp(start_date).normalize()
+        end = pd.Timestamp(end_date).normalize()
+
+        if self.returns is None or start < self.start or end > self.end:
+            covered_start = min(start, self.start) if self.start is not None else start
+            covered_end = max(end, self.end) if self.end is not None else end
+
+            prices = self.cache.get(self.ticker, start_date=covered_start.date(), end_date=covered_end.date(), interval="1d")
+            if len(prices) > 0:
+                returns = prices \
+                    .pipe(percentage_returns, price_colname="Adj Close", output_colname="risk_free_returns") \
+                    .fillna(0.0)["risk_free_returns"]
+                returns.index = pd.DatetimeIndex(returns.index).tz_localize(None)
+            else:
+                returns = pd.Series(dtype=float, name="risk_free_returns")
+
+            self.returns, self.start, self.end = returns, covered_start, covered_end
+
+        return self.returns[(self.returns.index >= start) & (self.returns.index < end)]
+
+    def align(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Risk-free returns accrued at each step of `index` (daily or intraday), without look-ahead.
+
+        A trading day's return is only known after that day, so it is accrued on the first step dated strictly after
+        it, once, and steps in between accrue 0.0. Intraday, the first bar of each day gets the previous trading
+        day's return and the other bars 0.0, so the returns summed over a day are one day's return. Days of the
+        risk-free proxy between two steps (e.g. over a gap in the data) are compounded onto the later step.
+        """
+        index = pd.DatetimeIndex(index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+
+        if len(index) == 0:
+            return np.array([], dtype=float)
+
+        # Look back far enough for the first step to have a previous trading day.
+        returns = self.get(index[0] - timedelta(days=7), index[-1] + timedelta(days=1))
+
+        dates = index.normalize()
+        return_dates = returns.index.normalize()
+
+        # Before the first step, only the latest return (the one the first step accrues) is kept.
+        before = return_dates < dates[0]
+        if before.any():
+            keep = ~before | (return_dates == return_dates[before].max())
+            returns, return_dates = returns[keep], return_dates[keep]
+
+        # First step dated strictly after each return's day.
+        positions = dates.searchsorted(return_dates, side="right")
+        accrued = positions < len(index)
+
+        log_returns = np.zeros(len(index))
+        np.add.at(log_returns, positions[accrued], np.log1p(returns.to_numpy(dtype=float)[accrued]))
+        return np.expm1(log_returns)
+
+
+def get_data_us_treasury_note_10yr(start_date: str, end_date: str, ticker: str = "TNX") -> pd.DataFrame:
+    """
+    Use the 10-Year US Treasury Note to indicate risk free return
+    """
+    rates = get_risk_free_rates()
+    rates = rates if rates.ticker == ticker else RiskFreeRates(ticker=ticker)
+    return rates.get(datetime.strptime(start_date, "%Y-%m-%d"), datetime.strptime(end_date, "%Y-%m-%d")).to_frame()
+
+
+# Shared by every caller in the process unless replaced, e.g. with one backed by a stub downloader.
+_default_rates = None
+
+
+def get_risk_free_rates() -> RiskFreeRates:
+    global _default_rates
+    if _default_rates is None:
+        _default_rates = RiskFreeRates()
+    return _default_rates
+
 
-    return df[[output_colname]]
+def set_risk_free_rates(rates: RiskFreeRates) -> None:
+    global _default_rates
+    _default_rates = rates
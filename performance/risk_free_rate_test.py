@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from etl.cache import PriceCache
+from performance.risk_free_rate import RiskFreeRates
+
+
+def _rates(tmp_path, dates, prices) -> RiskFreeRates:
+    # Risk-free proxy with the given daily prices, served by a stub downloader.
+    prices = pd.DataFrame({"Adj Close": prices}, index=pd.DatetimeIndex(dates, name="Date"))
+
+    def downloader(ticker, start, end, interval):
+        return prices[(prices.index >= start) & (prices.index < end)]
+
+    return RiskFreeRates(cache=PriceCache(cache_dir=tmp_path, downloader=downloader))
+
+
+def test_align_hourly(tmp_path):
+    # Daily returns: 0.0 (first day), 0.111 on Tue, 0.1 on Wed.
+    rates = _rates(tmp_path, ["2021-01-04", "2021-01-05", "2021-01-06"], [1.0, 1.111, 1.2221])
+    index = pd.date_range("2021-01-05", periods=48, freq="h")
+    aligned = rates.align(index)
+
+    # No look-ahead: Tuesday's bars never see Tuesday's return, which is accrued once, on Wednesday's first bar.
+    expected = np.zeros(48)
+    expected[24] = 0.111
+    np.testing.assert_allclose(aligned, expected, atol=1e-12)
+
+
+def test_align_daily_missing_proxy_day(tmp_path):
+    # No proxy price on Wed: Thursday's return is not repeated.
+    rates = _rates(tmp_path, ["2021-01-04", "2021-01-05", "2021-01-07", "2021-01-08"], [1.0, 1.1, 1.21, 1.331])
+    index = pd.bdate_range("2021-01-05", "2021-01-11")
+    aligned = rates.align(index)
+
+    np.testing.assert_allclose(aligned, [0.0, 0.1, 0.0, 0.1, 0.1], atol=1e-12)
+    np.testing.assert_allclose(np.prod(1.0 + aligned) - 1.0, 1.331 - 1.0)
+
+
+def test_align_compounds_over_gaps(tmp_path):
+    # Returns of 0.1 on Tue, Wed and Thu, all closing between the two steps.
+    rates = _rates(tmp_path, ["2021-01-04", "2021-01-05", "2021-01-06", "2021-01-07"], [1.0, 1.1, 1.21, 1.331])
+    aligned = rates.align(pd.DatetimeIndex(["2021-01-05", "2021-01-08"]))
+
+    np.testing.assert_allclose(aligned, [0.0, 1.1 ** 3 - 1.0], atol=1e-12)
@@ -0,0 +1,125 @@
+import numpy as np
+from typing import Dict, Optional
+
+
+class StreamingPerformance:
+    """
+    Performance metrics of a portfolio, kept current in O(1) per update of its net asset value (NAV), so a live
+    process or a backtest can report risk at any step without recomputing the history.
+
+    Per update, the simple return from the previous NAV feeds running sums for:
+        Sharpe ratio:  mean / (sample) standard deviation of excess returns (Welford's algorithm).
+        Sortino ratio: mean excess return / downside deviation, sqrt(E[min(excess_returns, 0)^2]), as in
+                       `performance_metrics.expanding_sortino_ratio`.
+        Max drawdown:  largest fall of NAV from its running peak, as a fraction of the peak.
+        Hit rate:      fraction of non-zero returns that are positive.
+        Turnover:      mean traded value per step, as a fraction of NAV.
+
+    Args:
+        periods_per_year: to annualise the Sharpe and Sortino ratios, e.g. 252 for daily data.
+
+    Example usage:
+        performance = StreamingPerformance(periods_per_year=252)
+        for nav, traded_value in updates:
+            performance.update(nav, traded_value=traded_value)
+        performance.summary()
+    """
+
+    def __init__(self, periods_per_year: float = 252):
+        self.periods_per_year = periods_per_year
+
+        self.nav = None
+        self.nav_peak = None
+        self.num_updates = 0
+
+        # Excess returns.
+        self.n = 0
+        self.mean = 0.0
+        self.M2 = 0.0
+        self.sum_downside_sq = 0.0
+        self.num_positive = 0
+        self.num_nonzero = 0
+
+        self.drawdown = 0.0
+        self.max_drawdown = 0.0
+        self.sum_turnover = 0.0
+
+    def update(self, nav: float, traded_value: float = 0.0, risk_free_return: float = 0.0) -> None:
+        """
+        Args:
+            nav:              net asset value at this step.
+            traded_value:     absolute value traded since the previous update.
+            risk_free_return: return of the risk-free asset over the step.
+        """
+        if self.nav is not None and self.nav != 0.0:
+            excess_return = nav / self.nav - 1.0 - risk_free_return
+
+            self.n += 1
+            delta = excess_return - self.mean
+            self.mean += delta / self.n
+            self.M2 += delta * (excess_return - self.mean)
+            self.sum_downside_sq += min(excess_return, 0.0) ** 2
+
+            if excess_return != 0.0:
+                self.num_nonzero += 1
+                self.num_positive += excess_return > 0.0
+
+        self.nav = nav
+        self.nav_peak = nav if self.nav_peak is None else max(self.nav_peak, nav)
+        self.drawdown = 1.0 - nav / self.nav_peak if self.nav_peak > 0.0 else 0.0
+        self.max_drawdown = max(self.max_drawdown, self.drawdown)
+
+        self.num_updates += 1
+        if nav != 0.0:
+            self.sum_turnover += abs(traded_value) / abs(nav)
+
+    def update_many(
+            self,
+            navs: np.ndarray,
+            traded_values: Optional[np.ndarray] = None,
+            risk_free_returns: Optional[np.ndarray] = None,
+    ) -> "StreamingPerformance":
+        """Feed a whole NAV series, e.g. an equity curve from the vectorised backtests."""
+        traded_values = traded_values if traded_values is not None else np.zeros(len(navs))
+        risk_free_returns = risk_free_returns if risk_free_returns is not None else np.zeros(len(navs))
+
+        for nav, traded_value, risk_free_return in zip(navs, traded_values, risk_free_returns):
+            self.update(float(nav), traded_value=float(traded_value), risk_free_return=float(risk_free_return))
+
+        return self
+
+    @property
+    def std(self) -> float:
+        return np.sqrt(self.M2 / (self.n - 1)) if self.n > 1 else np.nan
+
+    @property
+    def downside_deviation(self) -> float:
+        return np.sqrt(self.sum_downside_sq / self.n) if self.n > 0 else np.nan
+
+    @property
+    def sharpe_ratio(self) -> float:
+        std = self.std
+        return self.mean / std * np.sqrt(self.periods_per_year) if std > 0.0 else np.nan
+
+    @property
+    def sortino_ratio(self) -> float:
+        downside_deviation = self.downside_deviation
+        return self.mean / downside_deviation * np.sqrt(self.periods_per_year) if downside_deviation > 0.0 else np.nan
+
+    @property
+    def hit_rate(self) -> float:
+        return self.num_positive / self.num_nonzero if self.num_nonzero > 0 else np.nan
+
+    @property
+    def turnover(self) -> float:
+        return self.sum_turnover / self.num_updates if self.num_updates > 0 else np.nan
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "sharpe_ratio_annual": self.sharpe_ratio,
+            "sortino_ratio_annual": self.sortino_ratio,
+            "max_drawdown": self.max_drawdown,
+            "drawdown": self.drawdown,
+            "hit_rate": self.hit_rate,
+            "turnover": self.turnover,
+        }